@@ -0,0 +1,364 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from generador_sintetico import GESTOS_SINTETICOS, generar_poses, generar_trayectoria, a_landmarks
+import motor_gestos
+from registro import RegistroAsincrono
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def cargar_controlador():
+    """Carga control-mouse.py como módulo (el nombre con guion no es importable)"""
+    ruta = os.path.join(DIRECTORIO, 'control-mouse.py')
+    spec = importlib.util.spec_from_file_location('control_mouse', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def crear_controlador(registro):
+    """
+    Crea el controlador real (requiere MediaPipe, PyAutoGUI y una pantalla)
+
+    No abre la cámara: eso solo ocurre en run().
+    """
+    modulo = cargar_controlador()
+    return modulo.CameraMouseControllerAdvanzado(registro=registro)
+
+
+class EstadoGestos:
+    """
+    Estado entre frames que el controlador en vivo mantiene alrededor de las
+    funciones de un frame de motor_gestos (historial de scroll, referencia
+    de zoom y posición suavizada del cursor)
+    """
+
+    def __init__(self, ancho=1920, alto=1080, sensibilidad=2.0, suavizado=0.7, umbral_pinza=0.03):
+        self.ancho = ancho
+        self.alto = alto
+        self.sensibilidad = sensibilidad
+        self.suavizado = suavizado
+        self.umbral_pinza = umbral_pinza
+        self.scroll_history = deque(maxlen=5)
+        self.zoom_reference_distance = None
+        self.current_x = 0.0
+        self.current_y = 0.0
+
+    def scroll(self, puntos_clave):
+        self.scroll_history.append(puntos_clave)
+        if len(self.scroll_history) < 3:
+            return None
+        return motor_gestos.direccion_scroll([self.scroll_history[i]['medio_tip'][1]
+                                              for i in range(len(self.scroll_history) - 3,
+                                                             len(self.scroll_history))])
+
+    def zoom(self, puntos_clave):
+        distancia = motor_gestos.distancia_zoom(puntos_clave)
+        if self.zoom_reference_distance is None:
+            self.zoom_reference_distance = distancia
+            return None
+        tipo = motor_gestos.direccion_zoom(self.zoom_reference_distance, distancia)
+        self.zoom_reference_distance = distancia
+        return tipo
+
+    def cursor(self, posicion):
+        final_x, final_y = motor_gestos.mapear_a_pantalla(
+            posicion[0], posicion[1], self.ancho, self.alto, self.sensibilidad)
+        self.current_x += (final_x - self.current_x) * self.suavizado
+        self.current_y += (final_y - self.current_y) * self.suavizado
+        return int(self.current_x), int(self.current_y)
+
+    def paso(self, mano):
+        """Pipeline completo de un frame, como procesar_deteccion_mano"""
+        puntos_clave = motor_gestos.puntos_clave_desde_landmarks(mano.landmark)
+        gesto = motor_gestos.clasificar_gesto(puntos_clave, self.umbral_pinza)
+        if gesto == 'scroll':
+            self.scroll(puntos_clave)
+        elif gesto == 'zoom':
+            self.zoom(puntos_clave)
+        self.cursor(puntos_clave['indice_tip'][:2])
+
+
+def medir(funcion, entradas, repeticiones):
+    """
+    Mide una función sobre una lista de entradas
+
+    Returns:
+        (ns por frame, mejor de `repeticiones`), (bytes pico por frame),
+        (bloques retenidos por frame)
+    """
+    n = len(entradas)
+
+    # Tiempo: mejor de varias repeticiones para reducir ruido del sistema
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        for entrada in entradas:
+            funcion(entrada)
+        mejor = min(mejor, time.perf_counter_ns() - inicio)
+
+    # Memoria: pico transitorio por frame (memoria asignada y liberada
+    # dentro de la llamada) y bloques que quedan vivos tras la llamada
+    tracemalloc.start()
+    pico_total = 0
+    bloques_antes = sys.getallocatedblocks()
+    for entrada in entradas:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        funcion(entrada)
+        pico_total += tracemalloc.get_traced_memory()[1] - base
+    bloques_despues = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    return mejor / n, pico_total / n, (bloques_despues - bloques_antes) / n
+
+
+def generar_entradas(frames, semilla):
+    """
+    Genera las entradas sintéticas comunes
+
+    Returns:
+        (manos de todos los gestos, trayectorias de scroll, zoom y apuntar),
+        todo como landmarks
+    """
+    por_gesto = max(1, frames // len(GESTOS_SINTETICOS))
+    poses = np.concatenate([
+        generar_poses(gesto, por_gesto, ruido=0.002, rotacion_max=5.0,
+                      escala=(0.9, 1.1), traslacion_max=0.05, semilla=semilla + i)
+        for i, gesto in enumerate(GESTOS_SINTETICOS)
+    ])
+    trayectorias = {gesto: [a_landmarks(pose) for pose in generar_trayectoria(gesto, frames, semilla=semilla)]
+                    for gesto in ('scroll', 'zoom', 'apuntar')}
+    return [a_landmarks(pose) for pose in poses], trayectorias
+
+
+def preparar_casos_motor(frames, semilla):
+    """Funciones de un frame de motor_gestos, con el estado entre frames del controlador"""
+    manos, trayectorias = generar_entradas(frames, semilla)
+    estado = EstadoGestos()
+
+    def puntos_clave(manos):
+        return [motor_gestos.puntos_clave_desde_landmarks(mano.landmark) for mano in manos]
+
+    return {
+        'puntos_clave_desde_landmarks': (lambda mano: motor_gestos.puntos_clave_desde_landmarks(mano.landmark),
+                                         manos),
+        'clasificar_gesto': (lambda pc: motor_gestos.clasificar_gesto(pc, estado.umbral_pinza),
+                             puntos_clave(manos)),
+        'direccion_scroll': (estado.scroll, puntos_clave(trayectorias['scroll'])),
+        'direccion_zoom': (estado.zoom, puntos_clave(trayectorias['zoom'])),
+        'mapear_y_suavizar': (estado.cursor,
+                              [pc['indice_tip'][:2] for pc in puntos_clave(trayectorias['apuntar'])])
+    }
+
+
+def preparar_casos_controlador(ctrl, frames, semilla):
+    """Los mismos casos a través de los métodos del controlador real"""
+    manos, trayectorias = generar_entradas(frames, semilla)
+
+    def puntos_clave(manos):
+        return [ctrl.extraer_puntos_clave_mano(mano) for mano in manos]
+
+    def scroll_paso(pc):
+        ctrl.scroll_history.append(pc)
+        return ctrl.detectar_movimiento_scroll(pc)
+
+    return {
+        'controlador:extraer_puntos_clave_mano': (ctrl.extraer_puntos_clave_mano, manos),
+        'controlador:analizar_gesto_mano': (ctrl.analizar_gesto_mano, puntos_clave(manos)),
+        'controlador:detectar_movimiento_scroll': (scroll_paso, puntos_clave(trayectorias['scroll'])),
+        'controlador:detectar_zoom_gesture': (ctrl.detectar_zoom_gesture, puntos_clave(trayectorias['zoom'])),
+        'controlador:mapear_a_coordenadas_pantalla': (ctrl.mapear_a_coordenadas_pantalla,
+                                                      [pc['indice_tip'][:2]
+                                                       for pc in puntos_clave(trayectorias['apuntar'])])
+    }
+
+
+def paso_controlador(ctrl):
+    """Pipeline de gestos de un frame a través del controlador real (sin acciones del mouse)"""
+    def paso(mano):
+        puntos_clave = ctrl.extraer_puntos_clave_mano(mano)
+        gesto = ctrl.analizar_gesto_mano(puntos_clave)
+        ctrl.historial_posiciones.append(puntos_clave)
+        if gesto == 'scroll':
+            ctrl.scroll_history.append(puntos_clave)
+            ctrl.detectar_movimiento_scroll(puntos_clave)
+        elif gesto == 'zoom':
+            ctrl.detectar_zoom_gesture(puntos_clave)
+        ctrl.mapear_a_coordenadas_pantalla(puntos_clave['indice_tip'][:2])
+    return paso
+
+
+def preparar_casos_lote(frames, semilla):
+    """Genera un lote (N, 21, 3) y las funciones por lotes del motor a medir"""
+    por_gesto = max(1, frames // len(GESTOS_SINTETICOS))
+    landmarks = np.concatenate([
+        generar_trayectoria(gesto, por_gesto, semilla=semilla + i)
+        for i, gesto in enumerate(GESTOS_SINTETICOS)
+    ])
+    posiciones = landmarks[:, 8, :2]
+
+    return landmarks, {
+        'lote:extraer_puntos_clave': lambda: motor_gestos.extraer_puntos_clave_lote(landmarks),
+        'lote:clasificar_gestos': lambda: motor_gestos.clasificar_gestos_lote(landmarks, 0.03),
+        'lote:direcciones_scroll': lambda: motor_gestos.direcciones_scroll_lote(landmarks),
+        'lote:direcciones_zoom': lambda: motor_gestos.direcciones_zoom_lote(landmarks),
+        'lote:mapear_y_suavizar': lambda: motor_gestos.suavizar_lote(
+            motor_gestos.mapear_a_pantalla_lote(posiciones, 1920, 1080, 2.0), 0.7)
+    }
+
+
+def medir_lote(funcion, n, repeticiones):
+    """Mide una función por lotes; devuelve ns y bytes pico por frame"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        funcion()
+        mejor = min(mejor, time.perf_counter_ns() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return mejor / n, pico / n
+
+
+def prueba_memoria_estable(paso, frames_totales, bloque, limite_kb, semilla):
+    """
+    Ejecuta el pipeline de gestos de un frame (`paso(mano)`) durante muchos
+    frames y verifica que la memoria no crezca tras el calentamiento
+
+    Returns:
+        (crecimiento en KB, True si está dentro del límite)
+    """
+    trayectorias = [generar_trayectoria(gesto, bloque, semilla=semilla + i)
+                    for i, gesto in enumerate(GESTOS_SINTETICOS)]
+    manos = [a_landmarks(pose) for trayectoria in trayectorias for pose in trayectoria]
+
+    def ejecutar_bloque():
+        for mano in manos:
+            paso(mano)
+
+    # Calentamiento: llenar historiales y cachés
+    ejecutar_bloque()
+
+    tracemalloc.start()
+    inicial = tracemalloc.get_traced_memory()[0]
+    repeticiones = max(1, frames_totales // len(manos))
+    for _ in range(repeticiones):
+        ejecutar_bloque()
+    final = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    crecimiento_kb = (final - inicial) / 1024
+    return crecimiento_kb, crecimiento_kb <= limite_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la capa de gestos con datos sintéticos')
+    parser.add_argument('--frames', type=int, default=7000,
+                       help='Frames sintéticos por función')
+    parser.add_argument('--repeticiones', type=int, default=5,
+                       help='Repeticiones por medición (se usa la mejor)')
+    parser.add_argument('--linea-base', default=None,
+                       help='Archivo JSON con la línea base de ns/frame por función')
+    parser.add_argument('--actualizar-linea-base', action='store_true',
+                       help='Guardar los resultados actuales como línea base')
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                       help='Regresión permitida sobre la línea base (0.25 = 25%%)')
+    parser.add_argument('--frames-memoria', type=int, default=200000,
+                       help='Frames de la prueba de memoria estable (0 para omitir)')
+    parser.add_argument('--limite-memoria-kb', type=float, default=64.0,
+                       help='Crecimiento máximo de memoria permitido en la prueba larga')
+    parser.add_argument('--semilla', type=int, default=1234,
+                       help='Semilla del generador sintético')
+    parser.add_argument('--controlador', action='store_true',
+                       help='Medir también los métodos del controlador real '
+                            '(requiere MediaPipe, PyAutoGUI y una pantalla)')
+    args = parser.parse_args()
+
+    registro = RegistroAsincrono(nivel='WARNING')
+
+    casos = preparar_casos_motor(args.frames, args.semilla)
+    paso = EstadoGestos().paso
+    ctrl = None
+    if args.controlador:
+        ctrl = crear_controlador(registro)
+        casos.update(preparar_casos_controlador(ctrl, args.frames, args.semilla))
+        paso = paso_controlador(ctrl)
+
+    linea_base = {}
+    if args.linea_base and os.path.exists(args.linea_base):
+        with open(args.linea_base, encoding='utf-8') as f:
+            linea_base = json.load(f)
+
+    print(f"{'Función':<44}{'ns/frame':>12}{'B pico/frame':>15}{'retenidos/frame':>17}{'vs base':>10}")
+    print("-" * 98)
+
+    resultados = {}
+    regresiones = []
+    for nombre, (funcion, entradas) in casos.items():
+        ns, pico, bloques = medir(funcion, entradas, args.repeticiones)
+        resultados[nombre] = ns
+
+        comparacion = ''
+        if nombre in linea_base:
+            relacion = ns / linea_base[nombre]
+            comparacion = f"{relacion:.2f}x"
+            if relacion > 1.0 + args.tolerancia:
+                regresiones.append((nombre, linea_base[nombre], ns))
+                comparacion += ' ❌'
+
+        print(f"{nombre:<44}{ns:>12.0f}{pico:>15.0f}{bloques:>17.2f}{comparacion:>10}")
+
+    landmarks, casos_lote = preparar_casos_lote(args.frames, args.semilla)
+    for nombre, funcion in casos_lote.items():
+        ns, pico = medir_lote(funcion, len(landmarks), args.repeticiones)
+        resultados[nombre] = ns
+
+        comparacion = ''
+        if nombre in linea_base:
+            relacion = ns / linea_base[nombre]
+            comparacion = f"{relacion:.2f}x"
+            if relacion > 1.0 + args.tolerancia:
+                regresiones.append((nombre, linea_base[nombre], ns))
+                comparacion += ' ❌'
+
+        print(f"{nombre:<44}{ns:>12.0f}{pico:>15.0f}{'-':>17}{comparacion:>10}")
+
+    if args.frames_memoria > 0:
+        crecimiento, ok = prueba_memoria_estable(paso, args.frames_memoria, 500,
+                                                 args.limite_memoria_kb, args.semilla)
+        estado = "✅" if ok else "❌"
+        print(f"\n{estado} Memoria estable tras {args.frames_memoria} frames: "
+              f"{crecimiento:+.1f} KB (límite {args.limite_memoria_kb:.0f} KB)")
+        if not ok:
+            regresiones.append(('memoria_estable', args.limite_memoria_kb, crecimiento))
+
+    if args.actualizar_linea_base and args.linea_base:
+        with open(args.linea_base, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"💾 Línea base guardada en {args.linea_base}")
+
+    if ctrl is not None:
+        ctrl.hands.close()
+    registro.cerrar()
+
+    if regresiones:
+        print("\n❌ Regresiones detectadas:")
+        for nombre, referencia, actual in regresiones:
+            print(f"  - {nombre}: {referencia:.0f} -> {actual:.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
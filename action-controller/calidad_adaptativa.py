@@ -0,0 +1,194 @@
+import time
+from collections import deque
+
+# Niveles de calidad, del más barato al más caro. Bajar tracking confidence
+# hace que MediaPipe re-ejecute menos veces el detector de palma, y la
+# escala reduce la imagen que recibe la inferencia (los landmarks son
+# normalizados, así que el mapeo a pantalla no cambia).
+NIVELES_CALIDAD = [
+    {'model_complexity': 0, 'min_tracking_confidence': 0.5, 'escala': 0.5},
+    {'model_complexity': 0, 'min_tracking_confidence': 0.6, 'escala': 0.75},
+    {'model_complexity': 0, 'min_tracking_confidence': 0.7, 'escala': 1.0},
+    {'model_complexity': 1, 'min_tracking_confidence': 0.6, 'escala': 0.75},
+    {'model_complexity': 1, 'min_tracking_confidence': 0.7, 'escala': 1.0},
+]
+
+
+class ControladorCalidad:
+    def __init__(self, fps_objetivo, registro, nivel_inicial=None,
+                 ventana=30, frames_estables=45, enfriamiento=3.0,
+                 margen_bajar=0.9, margen_subir=1.2, latencia_bajar=0.5, latencia_subir=0.35):
+        """
+        Ajusta la calidad de la inferencia para sostener un FPS objetivo
+
+        Mide FPS y latencia de inferencia en una ventana deslizante y sube o
+        baja un nivel de NIVELES_CALIDAD. Los FPS medidos nunca superan los
+        de la cámara, así que para subir se mira sobre todo el margen de
+        latencia que queda en el presupuesto del frame. Para no oscilar usa umbrales
+        distintos para bajar y subir, exige varios frames seguidos fuera de
+        rango, respeta un enfriamiento tras cada cambio y, si una subida
+        obliga a bajar de nuevo enseguida, penaliza ese nivel con un tiempo
+        de espera que se duplica en cada fallo.
+
+        Args:
+            fps_objetivo: FPS que se quiere sostener
+            registro: RegistroAsincrono donde anotar cambios y su efecto
+            nivel_inicial: Índice en NIVELES_CALIDAD (por defecto el más alto)
+            ventana: Frames usados para medir FPS y latencia
+            frames_estables: Frames seguidos fuera de rango antes de cambiar
+            enfriamiento: Segundos mínimos entre cambios
+            margen_bajar: Bajar si FPS < objetivo * margen_bajar
+            margen_subir: Subir también si FPS > objetivo * margen_subir
+            latencia_bajar: Bajar solo si latencia > presupuesto * latencia_bajar
+            latencia_subir: Subir si latencia < presupuesto * latencia_subir
+                y los FPS no están por debajo del objetivo
+        """
+        self.fps_objetivo = fps_objetivo
+        self.log = registro
+        self.nivel = len(NIVELES_CALIDAD) - 1 if nivel_inicial is None else nivel_inicial
+        self.frames_estables = frames_estables
+        self.enfriamiento = enfriamiento
+        self.margen_bajar = margen_bajar
+        self.margen_subir = margen_subir
+        self.latencia_bajar = latencia_bajar
+        self.latencia_subir = latencia_subir
+
+        self.tiempos_frame = deque(maxlen=ventana)
+        self.latencias = deque(maxlen=ventana)
+        self.frames_bajo = 0
+        self.frames_alto = 0
+        self.ultimo_cambio = time.time()
+
+        # Penalización por nivel: {nivel: (hasta_cuando, segundos)}
+        self.penalizaciones = {}
+
+        # Última subida (nivel, momento), para detectar subidas fallidas
+        self.ultima_subida = None
+
+        # Cambio pendiente de medir: (nivel_antes, nivel_despues, fps, latencia, frames)
+        self.cambio_en_medicion = None
+
+    @property
+    def configuracion(self):
+        """Parámetros del nivel de calidad actual"""
+        return NIVELES_CALIDAD[self.nivel]
+
+    def fps_actual(self):
+        """FPS medidos en la ventana deslizante"""
+        if len(self.tiempos_frame) < 2:
+            return 0.0
+        duracion = self.tiempos_frame[-1] - self.tiempos_frame[0]
+        if duracion <= 0:
+            return 0.0
+        return (len(self.tiempos_frame) - 1) / duracion
+
+    def latencia_actual(self):
+        """Latencia media de inferencia en la ventana (segundos)"""
+        if not self.latencias:
+            return 0.0
+        return sum(self.latencias) / len(self.latencias)
+
+    def registrar_frame(self, latencia_inferencia):
+        """
+        Registra un frame procesado y decide si hay que cambiar de nivel
+
+        Args:
+            latencia_inferencia: Segundos que tardó hands.process en este frame
+
+        Returns:
+            El dict del nuevo nivel si hubo cambio, None en otro caso
+        """
+        ahora = time.time()
+        self.tiempos_frame.append(ahora)
+        self.latencias.append(latencia_inferencia)
+
+        if len(self.tiempos_frame) < self.tiempos_frame.maxlen:
+            return None
+
+        fps = self.fps_actual()
+        latencia = self.latencia_actual()
+        self._medir_efecto(fps, latencia)
+
+        # Solo bajar si la inferencia pesa en el presupuesto del frame;
+        # si el cuello de botella es la cámara, bajar calidad no ayuda.
+        # Subir cuando sobra latencia: con la cámara limitando los FPS, el
+        # margen sobre el objetivo es solo una comprobación secundaria
+        presupuesto = 1.0 / self.fps_objetivo
+        fps_en_objetivo = fps >= self.fps_objetivo * self.margen_bajar
+        if not fps_en_objetivo and latencia > presupuesto * self.latencia_bajar:
+            self.frames_bajo += 1
+            self.frames_alto = 0
+        elif ((fps_en_objetivo and latencia < presupuesto * self.latencia_subir) or
+              fps > self.fps_objetivo * self.margen_subir):
+            self.frames_alto += 1
+            self.frames_bajo = 0
+        else:
+            self.frames_bajo = 0
+            self.frames_alto = 0
+
+        if ahora - self.ultimo_cambio < self.enfriamiento:
+            return None
+
+        if self.frames_bajo >= self.frames_estables and self.nivel > 0:
+            # Si acabamos de subir y hay que volver a bajar, penalizar el nivel
+            if self.ultima_subida and self.ultima_subida[0] == self.nivel and \
+                    ahora - self.ultima_subida[1] < self.enfriamiento * 10:
+                self._penalizar(self.nivel, ahora)
+            return self._cambiar_nivel(self.nivel - 1, fps, latencia, ahora)
+
+        # Subir requiere el doble de frames estables que bajar
+        if (self.frames_alto >= self.frames_estables * 2 and
+                self.nivel < len(NIVELES_CALIDAD) - 1):
+            siguiente = self.nivel + 1
+            hasta, _ = self.penalizaciones.get(siguiente, (0, 0))
+            if ahora >= hasta:
+                self.ultima_subida = (siguiente, ahora)
+                return self._cambiar_nivel(siguiente, fps, latencia, ahora)
+
+        return None
+
+    def _penalizar(self, nivel, ahora):
+        """Impide volver a un nivel que no sostuvo el objetivo"""
+        _, segundos = self.penalizaciones.get(nivel, (0, self.enfriamiento * 5))
+        segundos = min(segundos * 2, 600)
+        self.penalizaciones[nivel] = (ahora + segundos, segundos)
+        self.log.info("🎚️ Calidad: nivel %d penalizado %.0fs", nivel, segundos,
+                      evento='calidad_penalizacion', nivel_calidad=nivel, segundos=segundos)
+
+    def _cambiar_nivel(self, nuevo, fps, latencia, ahora):
+        """Aplica un cambio de nivel y lo deja pendiente de medición"""
+        anterior = self.nivel
+        self.nivel = nuevo
+        self.ultimo_cambio = ahora
+        self.frames_bajo = 0
+        self.frames_alto = 0
+        self.tiempos_frame.clear()
+        self.latencias.clear()
+        self.cambio_en_medicion = (anterior, nuevo, fps, latencia, 0)
+
+        config = NIVELES_CALIDAD[nuevo]
+        self.log.info("🎚️ Calidad %d -> %d (modelo=%d, tracking=%.1f, escala=%.2f) a %.1f FPS, %.1f ms",
+                      anterior, nuevo, config['model_complexity'],
+                      config['min_tracking_confidence'], config['escala'],
+                      fps, latencia * 1000,
+                      evento='calidad_cambio', nivel_calidad_anterior=anterior, nivel_calidad=nuevo,
+                      fps=fps, latencia_ms=latencia * 1000, **config)
+        return config
+
+    def _medir_efecto(self, fps, latencia):
+        """Anota el efecto de un cambio una vez que la ventana es estable"""
+        if self.cambio_en_medicion is None:
+            return
+
+        anterior, nuevo, fps_antes, latencia_antes, frames = self.cambio_en_medicion
+        frames += 1
+        if frames < self.frames_estables:
+            self.cambio_en_medicion = (anterior, nuevo, fps_antes, latencia_antes, frames)
+            return
+
+        self.log.info("🎚️ Efecto calidad %d -> %d: FPS %.1f -> %.1f, latencia %.1f -> %.1f ms",
+                      anterior, nuevo, fps_antes, fps, latencia_antes * 1000, latencia * 1000,
+                      evento='calidad_efecto', nivel_calidad_anterior=anterior, nivel_calidad=nuevo,
+                      fps_antes=fps_antes, fps_despues=fps,
+                      latencia_ms_antes=latencia_antes * 1000, latencia_ms_despues=latencia * 1000)
+        self.cambio_en_medicion = None
@@ -0,0 +1,188 @@
+import json
+import math
+import os
+import threading
+
+# Parámetros recargables: nombre -> (tipo, mínimo, máximo)
+# Se aplican entre frames sin reinicializar nada
+PARAMETROS_EN_CALIENTE = {
+    'sensitivity': (float, 0.1, 3.0),
+    'smoothing_factor': (float, 0.1, 1.0),
+    'umbral_pinza': (float, 0.005, 0.2),
+    'click_cooldown': (float, 0.0, 5.0),
+    'scroll_cooldown': (float, 0.0, 5.0),
+    'scroll_sensitivity': (int, 1, 50),
+    'zoom_sensitivity': (int, 1, 500),
+    'margen_zona': (float, 0.0, 0.4),
+    'click_mode_enabled': (bool, None, None),
+    'right_click_enabled': (bool, None, None),
+    'scroll_enabled': (bool, None, None),
+    'drag_drop_enabled': (bool, None, None),
+    'zoom_enabled': (bool, None, None),
+    'preview_fps': (float, 1.0, 60.0),
+    'preview_escala': (float, 0.1, 1.0)
+}
+
+# Requieren reabrir la cámara
+PARAMETROS_CAMARA = {
+    'camera_index': (int, 0, 16),
+    'camera_width': (int, 160, 3840),
+    'camera_height': (int, 120, 2160)
+}
+
+# Requieren reconstruir el grafo de MediaPipe Hands
+PARAMETROS_MODELO = {
+    'model_complexity': (int, 0, 1),
+    'min_detection_confidence': (float, 0.0, 1.0),
+    'min_tracking_confidence': (float, 0.0, 1.0)
+}
+
+PARAMETROS = {**PARAMETROS_EN_CALIENTE, **PARAMETROS_CAMARA, **PARAMETROS_MODELO}
+
+
+def validar_configuracion(datos):
+    """
+    Valida un dict de configuración completo
+
+    Returns:
+        dict con los valores convertidos a su tipo
+
+    Raises:
+        ValueError con todos los errores encontrados
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("la configuración debe ser un objeto JSON")
+
+    errores = []
+    valores = {}
+    for nombre, valor in datos.items():
+        if nombre not in PARAMETROS:
+            errores.append(f"parámetro desconocido '{nombre}'")
+            continue
+
+        tipo, minimo, maximo = PARAMETROS[nombre]
+        if tipo is bool:
+            if not isinstance(valor, bool):
+                errores.append(f"'{nombre}' debe ser true o false")
+                continue
+        else:
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                errores.append(f"'{nombre}' debe ser numérico")
+                continue
+            # json acepta Infinity, NaN y 1e999 (inf); int(inf) lanzaría OverflowError
+            if not math.isfinite(valor):
+                errores.append(f"'{nombre}' debe ser un número finito")
+                continue
+            if tipo is int and valor != int(valor):
+                errores.append(f"'{nombre}' debe ser entero")
+                continue
+            valor = tipo(valor)
+            if not minimo <= valor <= maximo:
+                errores.append(f"'{nombre}' fuera de rango ({minimo}-{maximo})")
+                continue
+
+        valores[nombre] = valor
+
+    if errores:
+        raise ValueError("; ".join(errores))
+    return valores
+
+
+class ObservadorConfiguracion:
+    def __init__(self, ruta, registro, intervalo=0.5):
+        """
+        Vigila un archivo JSON de configuración en un hilo en segundo plano
+
+        Cuando el archivo cambia lo lee y valida completo fuera del loop de
+        visión. Si es válido deja los parámetros modificados como un único
+        lote pendiente, que el controlador toma entre frames con
+        tomar_cambios(). Un archivo inválido (o a medio guardar) se rechaza
+        entero y se mantiene la configuración anterior.
+
+        Args:
+            ruta: Archivo JSON de configuración
+            registro: RegistroAsincrono
+            intervalo: Segundos entre comprobaciones del archivo
+        """
+        self.ruta = ruta
+        self.log = registro
+        self.intervalo = intervalo
+
+        self.aplicada = {}
+        self._pendiente = None
+        self._lock = threading.Lock()
+        self._firma = None
+        self._primera_comprobacion = True
+
+        # Primera lectura síncrona para que la configuración inicial se
+        # aplique antes de abrir la cámara y crear el modelo
+        self._comprobar()
+
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name='configuracion', daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            # Un error inesperado no debe matar al observador: se registra
+            # y se sigue vigilando el archivo
+            try:
+                self._comprobar()
+            except Exception as e:
+                self.log.error(f"❌ Error comprobando la configuración ({self.ruta}): {e}",
+                               evento='config_error')
+
+    def _comprobar(self):
+        """Relee el archivo si cambió su fecha de modificación o tamaño"""
+        try:
+            estado = os.stat(self.ruta)
+        except OSError:
+            # Se avisa al arrancar sin archivo (p. ej. ruta mal escrita) y
+            # cuando desaparece uno que existía, no en cada comprobación
+            if self._firma is not None:
+                self.log.warning(f"⚠️ No se encuentra el archivo de configuración {self.ruta}")
+                self._firma = None
+            elif self._primera_comprobacion:
+                self.log.warning(f"⚠️ No se encuentra el archivo de configuración {self.ruta}: "
+                                 "se usará la configuración por defecto hasta que se cree")
+            self._primera_comprobacion = False
+            return
+        self._primera_comprobacion = False
+
+        firma = (estado.st_mtime_ns, estado.st_size)
+        if firma == self._firma:
+            return
+        self._firma = firma
+
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                valores = validar_configuracion(json.load(f))
+        except (OSError, ValueError) as e:
+            self.log.error(f"❌ Configuración rechazada ({self.ruta}): {e}",
+                           evento='config_rechazada')
+            return
+
+        cambios = {nombre: valor for nombre, valor in valores.items()
+                   if self.aplicada.get(nombre) != valor}
+        if not cambios:
+            return
+
+        self.aplicada.update(cambios)
+        with self._lock:
+            # Si el controlador aún no tomó el lote anterior, se combinan
+            if self._pendiente:
+                self._pendiente.update(cambios)
+            else:
+                self._pendiente = cambios
+
+    def tomar_cambios(self):
+        """Devuelve el lote de cambios pendiente (o None) y lo vacía"""
+        if self._pendiente is None:
+            return None
+        with self._lock:
+            cambios, self._pendiente = self._pendiente, None
+        return cambios
+
+    def cerrar(self):
+        self._detener.set()
+        self._hilo.join(timeout=2.0)
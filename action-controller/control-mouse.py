@@ -9,33 +9,103 @@ import mediapipe as mp
 import warnings
 import os
 
+from registro import RegistroAsincrono
+from calidad_adaptativa import ControladorCalidad
+import motor_gestos
+from inferencia_remota import ClienteInferenciaRemota
+from estado_compartido import PublicadorEstado, calcular_flags
+from multicamara import FusionMultiCamara, MODOS_FUSION
+from configuracion import ObservadorConfiguracion, PARAMETROS_CAMARA, PARAMETROS_MODELO
+
 # Suprimir warnings molestos
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
 
 class CameraMouseControllerAdvanzado:
-    def __init__(self, sensitivity=2.0, smoothing_factor=0.7):
+    def __init__(self, sensitivity=2.0, smoothing_factor=0.7, registro=None, fps_objetivo=None,
+                 preview_fps=15, preview_escala=0.5, inferencia_remota=None,
+                 publicador_estado=None, camera_index=0, camera_width=1280, camera_height=720,
+                 observador_config=None, multicamara=None):
         """
         Controlador de mouse avanzado usando MediaPipe para detección de manos
         
         Args:
             sensitivity: Sensibilidad del movimiento (0.1-2.0)
             smoothing_factor: Factor de suavizado del movimiento (0.1-1.0)
+            registro: RegistroAsincrono para los mensajes (se crea uno si es None)
+            fps_objetivo: FPS a sostener ajustando la calidad (None = calidad fija)
+            preview_fps: FPS de la ventana de vista previa (independiente del control)
+            preview_escala: Escala de la vista previa respecto al frame de cámara
+            inferencia_remota: ClienteInferenciaRemota a usar en lugar de MediaPipe local
+            publicador_estado: PublicadorEstado donde publicar el estado en cada frame
+            camera_index: Índice de la cámara
+            camera_width, camera_height: Resolución solicitada a la cámara
+            observador_config: ObservadorConfiguracion con los cambios a aplicar en caliente
+            multicamara: FusionMultiCamara a usar en lugar de una sola cámara
         """
         self.sensitivity = sensitivity
         self.smoothing_factor = smoothing_factor
         
+        # Registro no bloqueante (nunca usar print en el loop de frames)
+        self.log = registro if registro is not None else RegistroAsincrono()
+        
+        # Parámetros del modelo (el controlador de calidad puede cambiarlos)
+        self.model_complexity = 1
+        self.min_detection_confidence = 0.8
+        self.min_tracking_confidence = 0.7
+        self.escala_inferencia = 1.0
+        
+        # Calidad adaptativa para sostener un FPS objetivo
+        self.controlador_calidad = None
+        if fps_objetivo and (inferencia_remota is not None or multicamara is not None):
+            self.log.warning("⚠️ La calidad adaptativa no aplica con inferencia remota ni multicámara")
+        elif fps_objetivo:
+            self.controlador_calidad = ControladorCalidad(fps_objetivo, self.log)
+            config = self.controlador_calidad.configuracion
+            self.model_complexity = config['model_complexity']
+            self.min_tracking_confidence = config['min_tracking_confidence']
+            self.escala_inferencia = config['escala']
+        
+        # Configuración inicial del archivo: los parámetros del modelo se
+        # toman antes de crear Hands para no construirlo dos veces
+        self.observador_config = observador_config
+        cambios_iniciales = observador_config.tomar_cambios() if observador_config else None
+        if cambios_iniciales and inferencia_remota is None and multicamara is None:
+            for nombre in PARAMETROS_MODELO:
+                if nombre in cambios_iniciales:
+                    setattr(self, nombre, cambios_iniciales[nombre])
+        
+        # Cámara (se abre en run)
+        self.camera_index = camera_index
+        self.camera_width = camera_width
+        self.camera_height = camera_height
+        
         # Inicializar MediaPipe
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,  # Solo una mano para control más estable
-            min_detection_confidence=0.8,
-            min_tracking_confidence=0.7
-        )
+        self.inferencia_remota = inferencia_remota is not None
+        self.multicamara = multicamara
+        if self.inferencia_remota:
+            # El cliente remoto tiene la misma interfaz que Hands (process/close)
+            self.hands = inferencia_remota
+        elif multicamara is not None:
+            # Cada cámara tiene su propio Hands; close() detiene las cámaras
+            self.hands = multicamara
+        else:
+            self.hands = self.crear_hands()
         self.mp_drawing = mp.solutions.drawing_utils
         
+        # Vista previa desacoplada de la tasa de control
+        self.preview_escala = preview_escala
+        self.periodo_preview = 1.0 / preview_fps
+        self.proximo_preview = 0.0
+        self.escala_hud = 1.0
+        
+        # Estado compartido para herramientas de monitoreo
+        self.publicador_estado = publicador_estado
+        self.fps = 0.0
+        self.tiempo_frame_anterior = None
+        
         # Variables de estado
         self.is_running = False
         self.mouse_enabled = False
@@ -49,6 +119,7 @@ class CameraMouseControllerAdvanzado:
         # Variables para suavizado de mouse
         self.current_x = 0
         self.current_y = 0
+        self.debug_counter = -1
         self.screen_width, self.screen_height = pyautogui.size()
         
         # Configurar PyAutoGUI
@@ -86,40 +157,59 @@ class CameraMouseControllerAdvanzado:
         self.zona_calibracion = None
         self.es_calibrado = False
         
+        # Calibración como estado del loop principal: cada esquina es el
+        # promedio de varios frames con la mano quieta
+        self.calibrando = False
+        self.capturando_esquina = False
+        self.puntos_calibracion = []
+        self.muestras_calibracion = []
+        self.frames_calibracion = 10
+        self.tolerancia_calibracion = 0.02
+        # Último resultado muestreado: con inferencia remota el mismo objeto
+        # se repite hasta que llega una respuesta nueva
+        self.resultado_calibracion = None
+        
         # Configuración de zona de control
         self.margen_zona = 0.1  # 10% de margen en los bordes
-        self.zona_control = {
+        self.zona_control = self.zona_control_por_defecto()
+        
+        if cambios_iniciales:
+            self.aplicar_configuracion(cambios_iniciales)
+        
+        self.log.info(f"📺 Resolución de pantalla: {self.screen_width}x{self.screen_height}")
+        self.log.info("")
+        self.log.info("🎮 Controles básicos:")
+        self.log.info("  - ESPACIO: Activar/pausar control del mouse")
+        self.log.info("  - 'c': Calibrar zona de control")
+        self.log.info("  - 's/a': Ajustar sensibilidad")
+        self.log.info("  - 'f/g': Ajustar suavizado")
+        self.log.info("  - 'r': Resetear calibración")
+        self.log.info("  - 'q': Salir")
+        self.log.info("")
+        self.log.info("🎮 Controles de funcionalidades:")
+        self.log.info("  - '1': Toggle Click básico (pinza)")
+        self.log.info("  - '2': Toggle Click derecho (gesto L)")
+        self.log.info("  - '3': Toggle Scroll (2 dedos)")
+        self.log.info("  - '4': Toggle Drag & Drop (pinza + mover)")
+        self.log.info("  - '5': Toggle Zoom (3 dedos)")
+        self.log.info("")
+        self.log.info("📋 Gestos de control:")
+        self.log.info("  - 👆 Apuntar (1 dedo): Mover cursor")
+        self.log.info("  - 🤏 Pinza (pulgar + índice): Click / Drag & Drop")
+        self.log.info("  - 🖖 Gesto L (pulgar + índice separados): Click derecho")
+        self.log.info("  - ✌️  Dos dedos (índice + medio): Scroll vertical")
+        self.log.info("  - 🖖 Tres dedos (índice + medio + anular): Zoom")
+        self.log.info("  - ✊ Puño cerrado: Pausar movimiento")
+        self.log.info("  - ✋ Mano abierta: Movimiento libre")
+
+    def zona_control_por_defecto(self):
+        """Zona de control sin calibrar, según el margen configurado"""
+        return {
             'x_min': self.margen_zona,
             'x_max': 1.0 - self.margen_zona,
             'y_min': self.margen_zona,
             'y_max': 1.0 - self.margen_zona
         }
-        
-        print(f"📺 Resolución de pantalla: {self.screen_width}x{self.screen_height}")
-        print("")
-        print("🎮 Controles básicos:")
-        print("  - ESPACIO: Activar/pausar control del mouse")
-        print("  - 'c': Calibrar zona de control")
-        print("  - 's/a': Ajustar sensibilidad")
-        print("  - 'f/g': Ajustar suavizado")
-        print("  - 'r': Resetear calibración")
-        print("  - 'q': Salir")
-        print("")
-        print("🎮 Controles de funcionalidades:")
-        print("  - '1': Toggle Click básico (pinza)")
-        print("  - '2': Toggle Click derecho (gesto L)")
-        print("  - '3': Toggle Scroll (2 dedos)")
-        print("  - '4': Toggle Drag & Drop (pinza + mover)")
-        print("  - '5': Toggle Zoom (3 dedos)")
-        print("")
-        print("📋 Gestos de control:")
-        print("  - 👆 Apuntar (1 dedo): Mover cursor")
-        print("  - 🤏 Pinza (pulgar + índice): Click / Drag & Drop")
-        print("  - 🖖 Gesto L (pulgar + índice separados): Click derecho")
-        print("  - ✌️  Dos dedos (índice + medio): Scroll vertical")
-        print("  - 🖖 Tres dedos (índice + medio + anular): Zoom")
-        print("  - ✊ Puño cerrado: Pausar movimiento")
-        print("  - ✋ Mano abierta: Movimiento libre")
 
     def initialize_camera(self, camera_index=0, width=1280, height=720):
         """Inicializar la cámara con alta resolución"""
@@ -136,182 +226,146 @@ class CameraMouseControllerAdvanzado:
             self.cam_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             self.cam_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             
-            print(f"📹 Cámara inicializada: {self.cam_width}x{self.cam_height}")
+            self.log.info(f"📹 Cámara inicializada: {self.cam_width}x{self.cam_height}")
             return True
             
         except Exception as e:
-            print(f"❌ Error al inicializar cámara: {e}")
+            self.log.error(f"❌ Error al inicializar cámara: {e}")
             return False
 
+    def crear_hands(self):
+        """Crea el grafo de MediaPipe Hands con los parámetros actuales"""
+        return self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,  # Solo una mano para control más estable
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+    def aplicar_calidad(self, config):
+        """Aplica un nivel de calidad, recreando Hands solo si cambia el modelo"""
+        self.escala_inferencia = config['escala']
+        
+        if (config['model_complexity'] != self.model_complexity or
+                config['min_tracking_confidence'] != self.min_tracking_confidence):
+            self.model_complexity = config['model_complexity']
+            self.min_tracking_confidence = config['min_tracking_confidence']
+            self.hands.close()
+            self.hands = self.crear_hands()
+
+    def aplicar_configuracion(self, cambios):
+        """
+        Aplica un lote de cambios de configuración entre dos frames
+        
+        Los parámetros en caliente solo cambian atributos. La cámara y Hands
+        se reinicializan únicamente si cambió alguno de sus propios
+        parámetros, una vez por lote aunque cambien varios.
+        """
+        camara_anterior = (self.camera_index, self.camera_width, self.camera_height)
+        reabrir_camara = False
+        recrear_hands = False
+        
+        for nombre, valor in cambios.items():
+            if nombre in PARAMETROS_MODELO:
+                if self.inferencia_remota or self.multicamara is not None:
+                    self.log.warning("⚠️ %s no aplica con inferencia remota ni multicámara", nombre)
+                    continue
+                if getattr(self, nombre) == valor:
+                    continue
+                recrear_hands = True
+            elif nombre in PARAMETROS_CAMARA:
+                if self.multicamara is not None:
+                    self.log.warning("⚠️ %s no aplica en modo multicámara", nombre)
+                    continue
+                if getattr(self, nombre) == valor:
+                    continue
+                reabrir_camara = True
+            
+            if nombre == 'preview_fps':
+                self.periodo_preview = 1.0 / valor
+            else:
+                setattr(self, nombre, valor)
+            self.log.info("⚙️ %s = %s", nombre, valor, evento='config', parametro=nombre, valor=valor)
+        
+        if 'margen_zona' in cambios and not self.es_calibrado:
+            self.zona_control = self.zona_control_por_defecto()
+        
+        if recrear_hands:
+            if self.controlador_calidad is not None:
+                self.log.warning("⚠️ La calidad adaptativa puede volver a cambiar los parámetros del modelo")
+            self.hands.close()
+            self.hands = self.crear_hands()
+            self.log.info("🔄 MediaPipe Hands recreado", evento='config_modelo')
+        
+        # Antes de run() todavía no hay cámara abierta
+        if reabrir_camara and hasattr(self, 'cap'):
+            self.cap.release()
+            if not self.initialize_camera(self.camera_index, self.camera_width, self.camera_height):
+                self.log.warning("⚠️ Volviendo a la cámara anterior")
+                self.camera_index, self.camera_width, self.camera_height = camara_anterior
+                self.initialize_camera(*camara_anterior)
+
+    def inferir(self, frame):
+        """Ejecuta MediaPipe sobre el frame (BGR) a la escala de inferencia actual"""
+        if self.escala_inferencia < 1.0:
+            frame = cv2.resize(frame, None, fx=self.escala_inferencia, fy=self.escala_inferencia,
+                               interpolation=cv2.INTER_AREA)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        inicio = time.perf_counter()
+        results = self.hands.process(rgb_frame)
+        latencia = time.perf_counter() - inicio
+        
+        if self.controlador_calidad is not None:
+            nueva_config = self.controlador_calidad.registrar_frame(latencia)
+            if nueva_config is not None:
+                self.aplicar_calidad(nueva_config)
+        
+        return results
+
     def extraer_puntos_clave_mano(self, hand_landmarks):
         """Extrae puntos clave importantes de la mano"""
-        puntos = hand_landmarks.landmark
-        
-        puntos_clave = {
-            'muñeca': [puntos[0].x, puntos[0].y, puntos[0].z],
-            'pulgar_tip': [puntos[4].x, puntos[4].y, puntos[4].z],
-            'pulgar_ip': [puntos[3].x, puntos[3].y, puntos[3].z],
-            'indice_tip': [puntos[8].x, puntos[8].y, puntos[8].z],
-            'indice_pip': [puntos[6].x, puntos[6].y, puntos[6].z],
-            'medio_tip': [puntos[12].x, puntos[12].y, puntos[12].z],
-            'anular_tip': [puntos[16].x, puntos[16].y, puntos[16].z],
-            'meñique_tip': [puntos[20].x, puntos[20].y, puntos[20].z],
-            'centro_palma': [puntos[9].x, puntos[9].y, puntos[9].z]
-        }
-        
-        return puntos_clave
+        return motor_gestos.puntos_clave_desde_landmarks(hand_landmarks.landmark)
 
     def analizar_gesto_mano(self, puntos_clave):
         """Analiza el gesto de la mano para determinar la acción - VERSIÓN AVANZADA"""
-        # Calcular si los dedos están extendidos
-        dedos_extendidos = self.detectar_dedos_extendidos(puntos_clave)
-        
-        # Contar dedos extendidos
-        num_dedos = sum(dedos_extendidos.values())
-        
-        # Detectar gestos específicos
-        
-        # 1. PINZA para click o drag (pulgar + índice juntos)
-        if self.detectar_gesto_pinza(puntos_clave):
-            return 'pinza'
-        
-        # 2. GESTO L para click derecho (pulgar + índice en L)
-        if self.detectar_gesto_L(puntos_clave):
-            return 'click_derecho'
-        
-        # 3. DOS DEDOS para scroll (índice + medio)
-        if dedos_extendidos['indice'] and dedos_extendidos['medio'] and num_dedos == 2:
-            return 'scroll'
-        
-        # 4. TRES DEDOS para zoom (índice + medio + anular)
-        if (dedos_extendidos['indice'] and dedos_extendidos['medio'] and 
-            dedos_extendidos['anular'] and num_dedos == 3):
-            return 'zoom'
-        
-        # 5. SOLO ÍNDICE para mover cursor
-        if dedos_extendidos['indice'] and num_dedos == 1:
-            return 'apuntar'
-        
-        # 6. PUÑO CERRADO para pausar
-        if num_dedos <= 1:
-            return 'puño'
-        
-        # 7. MANO ABIERTA para movimiento libre
-        if num_dedos >= 4:
-            return 'abierta'
-        
-        # Default
-        return 'desconocido'
+        return motor_gestos.clasificar_gesto(puntos_clave, self.umbral_pinza)
 
     def detectar_dedos_extendidos(self, puntos_clave):
         """Detecta qué dedos están extendidos"""
-        dedos = {
-            'pulgar': False,
-            'indice': False,
-            'medio': False,
-            'anular': False,
-            'meñique': False
-        }
-        
-        # Pulgar (comparar X porque se mueve lateralmente)
-        if puntos_clave['pulgar_tip'][0] > puntos_clave['pulgar_ip'][0]:
-            dedos['pulgar'] = True
-        
-        # Otros dedos (comparar Y)
-        if puntos_clave['indice_tip'][1] < puntos_clave['indice_pip'][1]:
-            dedos['indice'] = True
-        
-        if puntos_clave['medio_tip'][1] < puntos_clave['centro_palma'][1]:
-            dedos['medio'] = True
-        
-        if puntos_clave['anular_tip'][1] < puntos_clave['centro_palma'][1]:
-            dedos['anular'] = True
-        
-        if puntos_clave['meñique_tip'][1] < puntos_clave['centro_palma'][1]:
-            dedos['meñique'] = True
-        
-        return dedos
+        return motor_gestos.dedos_extendidos(puntos_clave)
 
     def detectar_gesto_pinza(self, puntos_clave):
         """Detecta si se está haciendo gesto de pinza (pulgar e índice juntos)"""
-        pulgar = np.array(puntos_clave['pulgar_tip'][:2])
-        indice = np.array(puntos_clave['indice_tip'][:2])
-        
-        distancia = np.linalg.norm(pulgar - indice)
-        return distancia < self.umbral_pinza
+        return motor_gestos.es_pinza(puntos_clave, self.umbral_pinza)
 
     def detectar_gesto_L(self, puntos_clave):
         """Detecta gesto en L para click derecho (pulgar e índice perpendiculares)"""
-        dedos = self.detectar_dedos_extendidos(puntos_clave)
-        
-        # Solo pulgar e índice extendidos
-        if not (dedos['pulgar'] and dedos['indice'] and 
-                sum(dedos.values()) == 2):
-            return False
-        
-        # Verificar que estén separados (no en pinza)
-        pulgar = np.array(puntos_clave['pulgar_tip'][:2])
-        indice = np.array(puntos_clave['indice_tip'][:2])
-        distancia = np.linalg.norm(pulgar - indice)
-        
-        return distancia > self.umbral_pinza * 2  # Más separados que una pinza
+        return motor_gestos.es_gesto_L(puntos_clave, self.umbral_pinza)
 
     def detectar_movimiento_scroll(self, puntos_clave):
         """Detecta movimiento vertical para scroll"""
         if len(self.scroll_history) < 3:
             return None
         
-        # Usar posición del dedo medio para scroll
-        pos_actual = puntos_clave['medio_tip'][1]
-        
-        # Obtener posiciones previas de forma segura
-        posiciones_previas = []
-        for i in range(max(0, len(self.scroll_history) - 3), len(self.scroll_history)):
-            try:
-                if isinstance(self.scroll_history[i], dict) and 'medio_tip' in self.scroll_history[i]:
-                    posiciones_previas.append(self.scroll_history[i]['medio_tip'][1])
-            except (IndexError, TypeError, KeyError):
-                continue
-        
-        if len(posiciones_previas) < 2:
-            return None
+        # Usar posición del dedo medio en los últimos 3 frames de scroll
+        posiciones_previas = [self.scroll_history[i]['medio_tip'][1]
+                              for i in range(len(self.scroll_history) - 3, len(self.scroll_history))]
         
-        # Calcular dirección promedio
-        diferencias = []
-        for i in range(1, len(posiciones_previas)):
-            diferencias.append(posiciones_previas[i] - posiciones_previas[i-1])
-        
-        if not diferencias:
-            return None
-        
-        movimiento_promedio = np.mean(diferencias)
-        
-        # Determinar dirección si el movimiento es significativo
-        if abs(movimiento_promedio) > 0.005:  # Umbral de sensibilidad
-            return 'arriba' if movimiento_promedio < 0 else 'abajo'
-        
-        return None
+        return motor_gestos.direccion_scroll(posiciones_previas)
 
     def detectar_zoom_gesture(self, puntos_clave):
         """Detecta gesto de zoom usando separación de dedos"""
-        # Usar distancia entre índice y anular como referencia de zoom
-        indice = np.array(puntos_clave['indice_tip'][:2])
-        anular = np.array(puntos_clave['anular_tip'][:2])
-        distancia_actual = np.linalg.norm(indice - anular)
+        distancia_actual = motor_gestos.distancia_zoom(puntos_clave)
         
         if self.zoom_reference_distance is None:
             self.zoom_reference_distance = distancia_actual
             return None
         
-        # Calcular cambio en la distancia
-        cambio = distancia_actual - self.zoom_reference_distance
+        tipo_zoom = motor_gestos.direccion_zoom(self.zoom_reference_distance, distancia_actual)
         self.zoom_reference_distance = distancia_actual
-        
-        # Determinar dirección del zoom
-        if abs(cambio) > 0.01:  # Umbral de sensibilidad
-            return 'zoom_in' if cambio > 0 else 'zoom_out'
-        
-        return None
+        return tipo_zoom
 
     def calcular_velocidades(self, puntos_actuales):
         """Calcula velocidades de movimiento"""
@@ -337,116 +391,107 @@ class CameraMouseControllerAdvanzado:
         }
 
     def calibrar_zona_control(self):
-        """Calibra la zona de control del mouse"""
-        print("\n🎯 CALIBRACIÓN DE ZONA DE CONTROL")
-        print("Instrucciones:")
-        print("1. Posiciona tu mano en la ESQUINA SUPERIOR IZQUIERDA de tu zona de control")
-        print("2. Presiona ESPACIO para marcar")
-        print("3. Posiciona tu mano en la ESQUINA INFERIOR DERECHA")
-        print("4. Presiona ESPACIO para confirmar")
-        print("5. ESC para cancelar")
-        
-        puntos_calibracion = []
-        
-        while len(puntos_calibracion) < 2:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
-            
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
-            
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                    
-                    puntos_clave = self.extraer_puntos_clave_mano(hand_landmarks)
-                    indice_pos = puntos_clave['indice_tip'][:2]
-                    
-                    # Dibujar punto de referencia
-                    x_pixel = int(indice_pos[0] * frame.shape[1])
-                    y_pixel = int(indice_pos[1] * frame.shape[0])
-                    cv2.circle(frame, (x_pixel, y_pixel), 10, (0, 255, 0), -1)
-            
-            # Mostrar instrucciones en pantalla
-            instruccion = "Esquina SUPERIOR IZQUIERDA" if len(puntos_calibracion) == 0 else "Esquina INFERIOR DERECHA"
-            cv2.putText(frame, f"Posiciona: {instruccion}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-            cv2.putText(frame, f"Punto {len(puntos_calibracion) + 1}/2 - ESPACIO para marcar", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            cv2.imshow('Calibración - Control de Mouse', frame)
-            
-            key = cv2.waitKey(1) & 0xFF
-            if key == 32:  # Espacio
-                if results.multi_hand_landmarks:
-                    puntos_clave = self.extraer_puntos_clave_mano(results.multi_hand_landmarks[0])
-                    puntos_calibracion.append(puntos_clave['indice_tip'][:2])
-                    print(f"✅ Punto {len(puntos_calibracion)} marcado")
-                else:
-                    print("❌ No se detecta mano")
-            elif key == 27:  # ESC
-                print("Calibración cancelada")
-                cv2.destroyWindow('Calibración - Control de Mouse')
-                return
+        """Inicia la calibración de la zona de control (no bloquea el loop principal)"""
+        if self.is_dragging:
+            self.terminar_drag()
+        
+        self.calibrando = True
+        self.capturando_esquina = False
+        self.puntos_calibracion = []
+        self.muestras_calibracion = []
+        
+        self.log.info("\n🎯 CALIBRACIÓN DE ZONA DE CONTROL")
+        self.log.info("Instrucciones:")
+        self.log.info("1. Posiciona tu mano en la ESQUINA SUPERIOR IZQUIERDA de tu zona de control")
+        self.log.info("2. Presiona ESPACIO y mantén la mano quieta un momento")
+        self.log.info("3. Posiciona tu mano en la ESQUINA INFERIOR DERECHA")
+        self.log.info("4. Presiona ESPACIO y mantén la mano quieta un momento")
+        self.log.info("5. ESC para cancelar")
+
+    def marcar_esquina_calibracion(self):
+        """Empieza a capturar la esquina actual"""
+        self.capturando_esquina = True
+        self.muestras_calibracion = []
+        self.log.info("⏳ Mantén la mano quieta...")
+
+    def cancelar_calibracion(self):
+        """Sale de la calibración sin cambiar la zona de control"""
+        self.calibrando = False
+        self.capturando_esquina = False
+        self.log.info("Calibración cancelada")
+
+    def actualizar_calibracion(self, results):
+        """
+        Acumula las muestras de la esquina en curso con el resultado del frame
         
-        # Procesar calibración
-        if len(puntos_calibracion) == 2:
-            p1, p2 = puntos_calibracion
-            
-            self.zona_control = {
-                'x_min': min(p1[0], p2[0]),
-                'x_max': max(p1[0], p2[0]),
-                'y_min': min(p1[1], p2[1]),
-                'y_max': max(p1[1], p2[1])
-            }
-            
-            self.es_calibrado = True
-            print("✅ Calibración completada!")
-            print(f"Zona de control: X({self.zona_control['x_min']:.2f}-{self.zona_control['x_max']:.2f}), "
-                  f"Y({self.zona_control['y_min']:.2f}-{self.zona_control['y_max']:.2f})")
+        La esquina se fija cuando hay `frames_calibracion` muestras seguidas
+        a menos de `tolerancia_calibracion` de su media. Si la mano se mueve
+        o se pierde, la ventana vuelve a empezar. Solo cuentan los resultados
+        nuevos, no las repeticiones del último resultado remoto.
+        """
+        if not self.capturando_esquina or results is self.resultado_calibracion:
+            return
+        self.resultado_calibracion = results
         
-        cv2.destroyWindow('Calibración - Control de Mouse')
-
-    def mapear_a_coordenadas_pantalla(self, pos_mano):
-        """Mapea posición de mano a coordenadas de pantalla - VERSIÓN SIMPLIFICADA"""
-        x_mano, y_mano = pos_mano
+        if not results.multi_hand_landmarks:
+            self.muestras_calibracion = []
+            return
         
-        # Mapeo directo y simple (sin calibración compleja)
-        # Movimiento natural: derecha = derecha, izquierda = izquierda
-        screen_x = x_mano * self.screen_width
-        screen_y = y_mano * self.screen_height
+        puntos_clave = self.extraer_puntos_clave_mano(results.multi_hand_landmarks[0])
+        muestra = puntos_clave['indice_tip'][:2]
         
-        # Aplicar sensibilidad de forma más directa
-        center_x = self.screen_width // 2
-        center_y = self.screen_height // 2
+        if self.muestras_calibracion:
+            media = np.mean(self.muestras_calibracion, axis=0)
+            if np.max(np.abs(np.subtract(muestra, media))) > self.tolerancia_calibracion:
+                self.muestras_calibracion = []
+        self.muestras_calibracion.append(muestra)
         
-        # Calcular offset desde el centro
-        offset_x = (screen_x - center_x) * self.sensitivity
-        offset_y = (screen_y - center_y) * self.sensitivity
+        if len(self.muestras_calibracion) < self.frames_calibracion:
+            return
         
-        # Aplicar offset al centro
-        final_x = center_x + offset_x
-        final_y = center_y + offset_y
+        esquina = np.mean(self.muestras_calibracion, axis=0)
+        self.puntos_calibracion.append((float(esquina[0]), float(esquina[1])))
+        self.capturando_esquina = False
+        self.muestras_calibracion = []
+        self.log.info(f"✅ Punto {len(self.puntos_calibracion)} marcado ({esquina[0]:.3f}, {esquina[1]:.3f})")
         
-        # Clampear a los límites de pantalla
-        final_x = max(0, min(self.screen_width - 1, final_x))
-        final_y = max(0, min(self.screen_height - 1, final_y))
+        if len(self.puntos_calibracion) == 2:
+            self.completar_calibracion()
+
+    def completar_calibracion(self):
+        """Calcula la zona de control a partir de las dos esquinas"""
+        p1, p2 = self.puntos_calibracion
+        
+        self.zona_control = {
+            'x_min': min(p1[0], p2[0]),
+            'x_max': max(p1[0], p2[0]),
+            'y_min': min(p1[1], p2[1]),
+            'y_max': max(p1[1], p2[1])
+        }
+        
+        self.es_calibrado = True
+        self.calibrando = False
+        self.log.info("✅ Calibración completada!")
+        self.log.info(f"Zona de control: X({self.zona_control['x_min']:.2f}-{self.zona_control['x_max']:.2f}), "
+              f"Y({self.zona_control['y_min']:.2f}-{self.zona_control['y_max']:.2f})",
+              evento='calibracion', **self.zona_control)
+
+    def mapear_a_coordenadas_pantalla(self, pos_mano):
+        """Mapea posición de mano a coordenadas de pantalla - VERSIÓN SIMPLIFICADA"""
+        x_mano, y_mano = pos_mano
+        
+        final_x, final_y = motor_gestos.mapear_a_pantalla(
+            x_mano, y_mano, self.screen_width, self.screen_height, self.sensitivity)
         
         # Aplicar suavizado más agresivo
         self.current_x += (final_x - self.current_x) * self.smoothing_factor
         self.current_y += (final_y - self.current_y) * self.smoothing_factor
         
-        # Debug: imprimir valores
-        if hasattr(self, 'debug_counter'):
-            self.debug_counter += 1
-        else:
-            self.debug_counter = 0
-            
-        # Imprimir debug cada 30 frames para no spamear
+        # Debug: imprimir valores cada 30 frames para no spamear
+        self.debug_counter += 1
         if self.debug_counter % 30 == 0:
-            print(f"DEBUG: Mano({x_mano:.2f}, {y_mano:.2f}) -> Screen({int(self.current_x)}, {int(self.current_y)})")
+            self.log.debug("DEBUG: Mano(%.2f, %.2f) -> Screen(%d, %d)",
+                           x_mano, y_mano, self.current_x, self.current_y)
         
         return int(self.current_x), int(self.current_y)
 
@@ -455,7 +500,7 @@ class CameraMouseControllerAdvanzado:
         try:
             pyautogui.moveTo(x, y)
         except pyautogui.FailSafeException:
-            print("🛑 FailSafe activado - mouse movido a esquina")
+            self.log.warning("🛑 FailSafe activado - mouse movido a esquina", evento='failsafe')
             self.mouse_enabled = False
 
     def realizar_click(self):
@@ -464,7 +509,7 @@ class CameraMouseControllerAdvanzado:
         if tiempo_actual - self.ultimo_click_tiempo > self.click_cooldown:
             pyautogui.click()
             self.ultimo_click_tiempo = tiempo_actual
-            print("🖱️ Click izquierdo!")
+            self.log.info("🖱️ Click izquierdo!", evento='click')
 
     def realizar_click_derecho(self):
         """Realiza un click derecho con cooldown"""
@@ -472,7 +517,7 @@ class CameraMouseControllerAdvanzado:
         if tiempo_actual - self.ultimo_click_tiempo > self.click_cooldown:
             pyautogui.rightClick()
             self.ultimo_click_tiempo = tiempo_actual
-            print("🖱️ Click derecho!")
+            self.log.info("🖱️ Click derecho!", evento='click_derecho')
 
     def realizar_scroll(self, direccion):
         """Realiza scroll en la dirección especificada"""
@@ -480,10 +525,10 @@ class CameraMouseControllerAdvanzado:
         if tiempo_actual - self.ultimo_scroll_tiempo > self.scroll_cooldown:
             if direccion == 'arriba':
                 pyautogui.scroll(self.scroll_sensitivity)
-                print("📜 Scroll arriba")
+                self.log.info("📜 Scroll arriba", evento='scroll', direccion='arriba')
             elif direccion == 'abajo':
                 pyautogui.scroll(-self.scroll_sensitivity)
-                print("📜 Scroll abajo")
+                self.log.info("📜 Scroll abajo", evento='scroll', direccion='abajo')
             
             self.ultimo_scroll_tiempo = tiempo_actual
 
@@ -493,7 +538,7 @@ class CameraMouseControllerAdvanzado:
             self.is_dragging = True
             self.drag_start_pos = posicion
             pyautogui.mouseDown()
-            print("🤏 Iniciando arrastre...")
+            self.log.info("🤏 Iniciando arrastre...", evento='drag_inicio')
 
     def terminar_drag(self):
         """Termina operación de arrastrar"""
@@ -501,26 +546,26 @@ class CameraMouseControllerAdvanzado:
             self.is_dragging = False
             self.drag_start_pos = None
             pyautogui.mouseUp()
-            print("🤏 Arrastre terminado!")
+            self.log.info("🤏 Arrastre terminado!", evento='drag_fin')
 
     def realizar_zoom(self, tipo_zoom):
         """Realiza zoom usando combinaciones de teclas"""
         if tipo_zoom == 'zoom_in':
             pyautogui.hotkey('ctrl', '+')
-            print("🔍 Zoom in")
+            self.log.info("🔍 Zoom in", evento='zoom', tipo='zoom_in')
         elif tipo_zoom == 'zoom_out':
             pyautogui.hotkey('ctrl', '-')
-            print("🔍 Zoom out")
+            self.log.info("🔍 Zoom out", evento='zoom', tipo='zoom_out')
 
     def ajustar_sensibilidad(self, delta):
         """Ajusta la sensibilidad"""
         self.sensitivity = max(0.1, min(3.0, self.sensitivity + delta))
-        print(f"🎛️ Sensibilidad: {self.sensitivity:.1f}")
+        self.log.info("🎛️ Sensibilidad: %.1f", self.sensitivity, evento='ajuste', sensitivity=self.sensitivity)
 
     def ajustar_suavizado(self, delta):
         """Ajusta el factor de suavizado"""
         self.smoothing_factor = max(0.1, min(1.0, self.smoothing_factor + delta))
-        print(f"🎛️ Suavizado: {self.smoothing_factor:.1f}")
+        self.log.info("🎛️ Suavizado: %.1f", self.smoothing_factor, evento='ajuste', smoothing_factor=self.smoothing_factor)
 
     def dibujar_zona_control(self, frame):
         """Dibuja la zona de control en el frame"""
@@ -539,68 +584,111 @@ class CameraMouseControllerAdvanzado:
         cv2.putText(frame, "ZONA DE CONTROL", (x1, y1 - 10), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
 
+    def texto_hud(self, frame, texto, posicion, tamaño, color, grosor):
+        """Escribe texto del HUD escalado al tamaño de la vista previa"""
+        e = self.escala_hud
+        cv2.putText(frame, texto, (int(posicion[0] * e), int(posicion[1] * e)),
+                    cv2.FONT_HERSHEY_SIMPLEX, tamaño * e, color, max(1, round(grosor * e)))
+
+    def dibujar_preview(self, frame, results, gesto, posicion_mouse):
+        """Genera la vista previa reducida con landmarks e interfaz"""
+        if self.preview_escala != 1.0:
+            preview = cv2.resize(frame, None, fx=self.preview_escala, fy=self.preview_escala,
+                                 interpolation=cv2.INTER_AREA)
+        else:
+            preview = frame
+        
+        # Los landmarks son normalizados, así que se dibujan igual a cualquier escala
+        if results.multi_hand_landmarks:
+            self.mp_drawing.draw_landmarks(preview, results.multi_hand_landmarks[0],
+                                           self.mp_hands.HAND_CONNECTIONS)
+        
+        self.escala_hud = self.preview_escala
+        self.dibujar_interfaz(preview, results, gesto, posicion_mouse)
+        if self.calibrando:
+            self.dibujar_calibracion(preview, results)
+        return preview
+
+    def dibujar_calibracion(self, frame, results):
+        """Dibuja el estado de la calibración sobre la vista previa"""
+        altura, ancho = frame.shape[:2]
+        radio = max(3, int(10 * self.escala_hud))
+        
+        # Esquinas ya marcadas
+        for x, y in self.puntos_calibracion:
+            cv2.circle(frame, (int(x * ancho), int(y * altura)), radio, (255, 255, 0), -1)
+        
+        # Punto de referencia: verde mientras se captura la esquina
+        if results.multi_hand_landmarks:
+            puntos_clave = self.extraer_puntos_clave_mano(results.multi_hand_landmarks[0])
+            x, y = puntos_clave['indice_tip'][:2]
+            color = (0, 255, 0) if self.capturando_esquina else (0, 255, 255)
+            cv2.circle(frame, (int(x * ancho), int(y * altura)), radio, color, -1)
+        
+        # Instrucciones en el panel
+        instruccion = "Esquina SUPERIOR IZQUIERDA" if len(self.puntos_calibracion) == 0 else "Esquina INFERIOR DERECHA"
+        self.texto_hud(frame, f"Calibrando - Posiciona: {instruccion}", (10, 170), 0.6, (0, 255, 255), 2)
+        if self.capturando_esquina:
+            estado = f"Mantén la mano quieta... {len(self.muestras_calibracion)}/{self.frames_calibracion}"
+        else:
+            estado = f"Punto {len(self.puntos_calibracion) + 1}/2 - ESPACIO para marcar | ESC para cancelar"
+        self.texto_hud(frame, estado, (10, 190), 0.5, (255, 255, 255), 1)
+
     def dibujar_interfaz(self, frame, results=None, gesto=None, posicion_mouse=None):
         """Dibuja la interfaz de usuario"""
         altura, ancho = frame.shape[:2]
         
-        # Panel de estado con fondo más grande
-        panel_height = 200
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (ancho, panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Alto del frame en coordenadas del HUD (texto_hud las reescala)
+        altura = int(altura / self.escala_hud)
+        
+        # Panel de estado con fondo más grande (oscurecer solo la franja del
+        # panel equivale a mezclarla al 70% con negro, sin copiar el frame)
+        panel_height = int(200 * self.escala_hud)
+        panel = frame[:panel_height]
+        cv2.addWeighted(panel, 0.3, panel, 0, 0, dst=panel)
         
         # Estado del sistema
         estado_color = (0, 255, 0) if self.mouse_enabled else (0, 0, 255)
         estado_texto = "🟢 ACTIVO - Moviendo cursor" if self.mouse_enabled else "🔴 PAUSADO - Presiona ESPACIO"
-        cv2.putText(frame, estado_texto, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, estado_color, 2)
+        self.texto_hud(frame, estado_texto, (10, 25), 0.7, estado_color, 2)
         
         # Configuración actual
-        cv2.putText(frame, f"Sensibilidad: {self.sensitivity:.1f}", (10, 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        cv2.putText(frame, f"Suavizado: {self.smoothing_factor:.1f}", (200, 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.texto_hud(frame, f"Sensibilidad: {self.sensitivity:.1f}", (10, 50), 0.5, (255, 255, 255), 1)
+        self.texto_hud(frame, f"Suavizado: {self.smoothing_factor:.1f}", (200, 50), 0.5, (255, 255, 255), 1)
         
         # Estado de funcionalidades - Línea 1
         funciones_y = 75
-        cv2.putText(frame, "Funciones:", (10, funciones_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        self.texto_hud(frame, "Funciones:", (10, funciones_y), 0.5, (255, 255, 0), 1)
         
         # Click básico
         click_color = (0, 255, 0) if self.click_mode_enabled else (100, 100, 100)
-        cv2.putText(frame, f"Click:{self.click_mode_enabled}", (100, funciones_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, click_color, 1)
+        self.texto_hud(frame, f"Click:{self.click_mode_enabled}", (100, funciones_y), 0.4, click_color, 1)
         
         # Click derecho
         right_color = (0, 255, 0) if self.right_click_enabled else (100, 100, 100)
-        cv2.putText(frame, f"R-Click:{self.right_click_enabled}", (200, funciones_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, right_color, 1)
+        self.texto_hud(frame, f"R-Click:{self.right_click_enabled}", (200, funciones_y), 0.4, right_color, 1)
         
         # Scroll
         scroll_color = (0, 255, 0) if self.scroll_enabled else (100, 100, 100)
-        cv2.putText(frame, f"Scroll:{self.scroll_enabled}", (320, funciones_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, scroll_color, 1)
+        self.texto_hud(frame, f"Scroll:{self.scroll_enabled}", (320, funciones_y), 0.4, scroll_color, 1)
         
         # Línea 2 de funciones
         funciones_y2 = 95
         # Drag & Drop
         drag_color = (0, 255, 0) if self.drag_drop_enabled else (100, 100, 100)
-        cv2.putText(frame, f"Drag&Drop:{self.drag_drop_enabled}", (100, funciones_y2), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, drag_color, 1)
+        self.texto_hud(frame, f"Drag&Drop:{self.drag_drop_enabled}", (100, funciones_y2), 0.4, drag_color, 1)
         
         # Zoom
         zoom_color = (0, 255, 0) if self.zoom_enabled else (100, 100, 100)
-        cv2.putText(frame, f"Zoom:{self.zoom_enabled}", (250, funciones_y2), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, zoom_color, 1)
+        self.texto_hud(frame, f"Zoom:{self.zoom_enabled}", (250, funciones_y2), 0.4, zoom_color, 1)
         
         # Estado de arrastre
         if self.is_dragging:
-            cv2.putText(frame, "🤏 ARRASTRANDO", (350, funciones_y2), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+            self.texto_hud(frame, "🤏 ARRASTRANDO", (350, funciones_y2), 0.5, (255, 0, 0), 2)
         
         # Estado de calibración
         calibracion_estado = "✅ Calibrado" if self.es_calibrado else "⚠️ Sin calibrar"
-        cv2.putText(frame, calibracion_estado, (10, 120), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if self.es_calibrado else (0, 255, 255), 1)
+        self.texto_hud(frame, calibracion_estado, (10, 120), 0.5, (0, 255, 0) if self.es_calibrado else (0, 255, 255), 1)
         
         # Gesto actual con colores específicos
         if gesto:
@@ -627,41 +715,49 @@ class CameraMouseControllerAdvanzado:
                 'desconocido': '❓ DESCONOCIDO'
             }.get(gesto, gesto.upper())
             
-            cv2.putText(frame, f"Gesto: {gesto_texto}", (10, 145), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, gesto_color, 2)
+            self.texto_hud(frame, f"Gesto: {gesto_texto}", (10, 145), 0.6, gesto_color, 2)
         
         # Posición del mouse
         if posicion_mouse:
-            cv2.putText(frame, f"Mouse: ({posicion_mouse[0]}, {posicion_mouse[1]})", 
-                       (200, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            self.texto_hud(frame, f"Mouse: ({posicion_mouse[0]}, {posicion_mouse[1]})", 
+                           (200, 25), 0.5, (255, 255, 255), 1)
             
             # Mostrar posición de mano también
             if results and results.multi_hand_landmarks:
                 hand_landmarks = results.multi_hand_landmarks[0]
                 puntos_clave = self.extraer_puntos_clave_mano(hand_landmarks)
                 pos_indice = puntos_clave['indice_tip'][:2]
-                cv2.putText(frame, f"Mano: ({pos_indice[0]:.2f}, {pos_indice[1]:.2f})", 
-                           (200, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
+                self.texto_hud(frame, f"Mano: ({pos_indice[0]:.2f}, {pos_indice[1]:.2f})", 
+                               (200, 45), 0.4, (255, 255, 0), 1)
         
         # Controles en la parte inferior - Línea 1
         controles_y1 = altura - 60
-        cv2.putText(frame, "ESPACIO:Toggle | C:Calibrar | S/A:Sens | F/G:Suav | R:Reset | Q:Salir", 
-                   (10, controles_y1), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
+        self.texto_hud(frame, "ESPACIO:Toggle | C:Calibrar | S/A:Sens | F/G:Suav | R:Reset | Q:Salir", 
+                      (10, controles_y1), 0.4, (255, 255, 0), 1)
         
         # Controles en la parte inferior - Línea 2  
         controles_y2 = altura - 40
-        cv2.putText(frame, "1:Click | 2:R-Click | 3:Scroll | 4:Drag&Drop | 5:Zoom", 
-                   (10, controles_y2), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+        self.texto_hud(frame, "1:Click | 2:R-Click | 3:Scroll | 4:Drag&Drop | 5:Zoom", 
+                      (10, controles_y2), 0.4, (0, 255, 255), 1)
         
         # Controles en la parte inferior - Línea 3
         controles_y3 = altura - 20
-        cv2.putText(frame, "Gestos: 👆=Mover | 🤏=Click/Drag | 🖖=R-Click | ✌️=Scroll | 🖖=Zoom | ✊=Pausa", 
-                   (10, controles_y3), cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1)
+        self.texto_hud(frame, "Gestos: 👆=Mover | 🤏=Click/Drag | 🖖=R-Click | ✌️=Scroll | 🖖=Zoom | ✊=Pausa", 
+                      (10, controles_y3), 0.35, (255, 255, 255), 1)
         
         # Dibujar zona de control
         self.dibujar_zona_control(frame)
 
-    def procesar_deteccion_mano(self, results, frame):
+    def actualizar_fps(self):
+        """Actualiza la media móvil de FPS del loop de control"""
+        ahora = time.perf_counter()
+        if self.tiempo_frame_anterior is not None:
+            dt = ahora - self.tiempo_frame_anterior
+            if dt > 0:
+                self.fps += (1.0 / dt - self.fps) * 0.1
+        self.tiempo_frame_anterior = ahora
+
+    def procesar_deteccion_mano(self, results):
         """Procesa la detección de manos y ejecuta acciones"""
         if not results.multi_hand_landmarks:
             return None, None
@@ -669,9 +765,6 @@ class CameraMouseControllerAdvanzado:
         # Usar solo la primera mano detectada
         hand_landmarks = results.multi_hand_landmarks[0]
         
-        # Dibujar landmarks
-        self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-        
         # Extraer puntos clave
         puntos_clave = self.extraer_puntos_clave_mano(hand_landmarks)
         
@@ -752,61 +845,103 @@ class CameraMouseControllerAdvanzado:
 
     def run(self):
         """Ejecuta el controlador principal"""
-        if not self.initialize_camera():
+        if self.multicamara is not None:
+            if not self.multicamara.abrir():
+                return
+        elif not self.initialize_camera(self.camera_index, self.camera_width, self.camera_height):
             return
         
         self.is_running = True
-        print("👆 PARA EMPEZAR:")
-        print("   1. Presiona ESPACIO para ACTIVAR el control")
-        print("   2. Usa gestos con tu mano:")
-        print("      👆 UN DEDO (índice) = Mover cursor")
-        print("      🤏 PINZA (pulgar + índice juntos) = Click / Arrastrar")
-        print("      🖖 GESTO L (pulgar + índice separados) = Click derecho")
-        print("      ✌️  DOS DEDOS (índice + medio) = Scroll vertical")
-        print("      🖖 TRES DEDOS (índice + medio + anular) = Zoom")
-        print("      ✊ PUÑO CERRADO = Pausar movimiento")
-        print()
-        print("🎛️ CONTROLES RÁPIDOS:")
-        print("   Teclas 1-5 para activar/desactivar funciones")
-        print("   S/A para sensibilidad, F/G para suavizado")
-        print("   C para calibrar zona personalizada")
-        print()
+        self.log.info("👆 PARA EMPEZAR:")
+        self.log.info("   1. Presiona ESPACIO para ACTIVAR el control")
+        self.log.info("   2. Usa gestos con tu mano:")
+        self.log.info("      👆 UN DEDO (índice) = Mover cursor")
+        self.log.info("      🤏 PINZA (pulgar + índice juntos) = Click / Arrastrar")
+        self.log.info("      🖖 GESTO L (pulgar + índice separados) = Click derecho")
+        self.log.info("      ✌️  DOS DEDOS (índice + medio) = Scroll vertical")
+        self.log.info("      🖖 TRES DEDOS (índice + medio + anular) = Zoom")
+        self.log.info("      ✊ PUÑO CERRADO = Pausar movimiento")
+        self.log.info("")
+        self.log.info("🎛️ CONTROLES RÁPIDOS:")
+        self.log.info("   Teclas 1-5 para activar/desactivar funciones")
+        self.log.info("   S/A para sensibilidad, F/G para suavizado")
+        self.log.info("   C para calibrar zona personalizada")
+        self.log.info("")
         if not self.es_calibrado:
-            print("💡 OPCIONAL: Presiona 'c' para calibrar zona de control personalizada")
-        print("🐛 DEBUG: Verás mensajes en consola con cada acción")
-        print()
+            self.log.info("💡 OPCIONAL: Presiona 'c' para calibrar zona de control personalizada")
+        self.log.info("🐛 DEBUG: Verás mensajes en consola con cada acción (--log-level DEBUG para el mapeo)")
+        self.log.info("")
         
         try:
             while self.is_running:
-                ret, frame = self.cap.read()
-                if not ret:
-                    print("❌ Error al leer frame de la cámara")
-                    break
+                # Configuración recargada: se aplica entera entre dos frames
+                if self.observador_config is not None:
+                    cambios = self.observador_config.tomar_cambios()
+                    if cambios:
+                        self.aplicar_configuracion(cambios)
                 
-                # Voltear frame para efecto espejo
-                frame = cv2.flip(frame, 1)
+                if self.multicamara is not None:
+                    # Captura e inferencia en paralelo por cámara, ya fusionadas
+                    frame, results = self.multicamara.siguiente()
+                    if results is False:
+                        self.log.error("❌ Ninguna cámara entrega frames")
+                        break
+                    if frame is None:
+                        # Cámaras atascadas: seguir atendiendo el teclado
+                        self.log.warning("⚠️ Sin frames nuevos de las cámaras")
+                        if cv2.waitKey(1) & 0xFF == ord('q'):
+                            break
+                        continue
+                else:
+                    ret, frame = self.cap.read()
+                    if not ret:
+                        self.log.error("❌ Error al leer frame de la cámara")
+                        break
+                    
+                    # Voltear frame para efecto espejo
+                    frame = cv2.flip(frame, 1)
+                    
+                    # Procesar con MediaPipe
+                    results = self.inferir(frame)
                 
-                # Procesar con MediaPipe
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.hands.process(rgb_frame)
+                # Procesar detección de manos (control a la tasa completa de la cámara).
+                # Durante la calibración el mismo resultado alimenta las esquinas
+                # y no se ejecutan acciones del mouse
+                if self.calibrando:
+                    self.actualizar_calibracion(results)
+                    gesto, posicion_mouse = None, None
+                else:
+                    gesto, posicion_mouse = self.procesar_deteccion_mano(results)
                 
-                # Procesar detección de manos
-                gesto, posicion_mouse = self.procesar_deteccion_mano(results, frame)
+                # FPS del loop de control y publicación del estado compartido
+                self.actualizar_fps()
+                if self.publicador_estado is not None:
+                    self.publicador_estado.publicar(
+                        self.current_x, self.current_y, self.fps, gesto, calcular_flags(self),
+                        self.sensitivity, self.smoothing_factor)
                 
-                # Dibujar interfaz
-                self.dibujar_interfaz(frame, results, gesto, posicion_mouse)
+                # Vista previa a su propia tasa: solo se dibuja cuando toca
+                ahora = time.time()
+                if ahora < self.proximo_preview:
+                    continue
+                self.proximo_preview = max(self.proximo_preview + self.periodo_preview, ahora)
                 
-                # Mostrar frame
-                cv2.imshow('Control de Mouse Avanzado - MediaPipe', frame)
+                preview = self.dibujar_preview(frame, results, gesto, posicion_mouse)
+                cv2.imshow('Control de Mouse Avanzado - MediaPipe', preview)
                 
-                # Procesar teclas
+                # Procesar teclas (quedan en cola entre frames de vista previa)
                 key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     break
+                elif self.calibrando:
+                    if key == 32:  # Espacio
+                        self.marcar_esquina_calibracion()
+                    elif key == 27:  # ESC
+                        self.cancelar_calibracion()
                 elif key == 32:  # Espacio
                     self.mouse_enabled = not self.mouse_enabled
                     estado = "activado" if self.mouse_enabled else "pausado"
-                    print(f"🖱️ Control de mouse {estado}")
+                    self.log.info("🖱️ Control de mouse %s", estado, evento='toggle', mouse_enabled=self.mouse_enabled)
                 elif key == ord('c'):
                     self.calibrar_zona_control()
                     
@@ -814,23 +949,23 @@ class CameraMouseControllerAdvanzado:
                 elif key == ord('1'):
                     self.click_mode_enabled = not self.click_mode_enabled
                     estado = "activado" if self.click_mode_enabled else "desactivado"
-                    print(f"🖱️ Click básico {estado}")
+                    self.log.info("🖱️ Click básico %s", estado, evento='toggle', click_mode_enabled=self.click_mode_enabled)
                 elif key == ord('2'):
                     self.right_click_enabled = not self.right_click_enabled
                     estado = "activado" if self.right_click_enabled else "desactivado"
-                    print(f"🖱️ Click derecho {estado}")
+                    self.log.info("🖱️ Click derecho %s", estado, evento='toggle', right_click_enabled=self.right_click_enabled)
                 elif key == ord('3'):
                     self.scroll_enabled = not self.scroll_enabled
                     estado = "activado" if self.scroll_enabled else "desactivado"
-                    print(f"📜 Scroll {estado}")
+                    self.log.info("📜 Scroll %s", estado, evento='toggle', scroll_enabled=self.scroll_enabled)
                 elif key == ord('4'):
                     self.drag_drop_enabled = not self.drag_drop_enabled
                     estado = "activado" if self.drag_drop_enabled else "desactivado"
-                    print(f"🤏 Drag & Drop {estado}")
+                    self.log.info("🤏 Drag & Drop %s", estado, evento='toggle', drag_drop_enabled=self.drag_drop_enabled)
                 elif key == ord('5'):
                     self.zoom_enabled = not self.zoom_enabled
                     estado = "activado" if self.zoom_enabled else "desactivado"
-                    print(f"🔍 Zoom {estado}")
+                    self.log.info("🔍 Zoom %s", estado, evento='toggle', zoom_enabled=self.zoom_enabled)
                     
                 # Ajustes
                 elif key == ord('s'):
@@ -845,16 +980,11 @@ class CameraMouseControllerAdvanzado:
                     self.es_calibrado = False
                     self.zoom_reference_distance = None
                     self.is_dragging = False
-                    self.zona_control = {
-                        'x_min': self.margen_zona,
-                        'x_max': 1.0 - self.margen_zona,
-                        'y_min': self.margen_zona,
-                        'y_max': 1.0 - self.margen_zona
-                    }
-                    print("🔄 Sistema reseteado completamente")
+                    self.zona_control = self.zona_control_por_defecto()
+                    self.log.info("🔄 Sistema reseteado completamente")
         
         except KeyboardInterrupt:
-            print("\n🛑 Interrupción del usuario")
+            self.log.info("\n🛑 Interrupción del usuario")
         
         finally:
             self.cleanup()
@@ -867,14 +997,17 @@ class CameraMouseControllerAdvanzado:
         if self.is_dragging:
             try:
                 pyautogui.mouseUp()
-                print("🤏 Terminando arrastre pendiente...")
+                self.log.info("🤏 Terminando arrastre pendiente...")
             except:
                 pass
         
         if hasattr(self, 'cap'):
             self.cap.release()
+        self.hands.close()
+        if self.publicador_estado is not None:
+            self.publicador_estado.cerrar()
         cv2.destroyAllWindows()
-        print("🧹 Recursos liberados")
+        self.log.info("🧹 Recursos liberados")
 
 
 def main():
@@ -885,32 +1018,106 @@ def main():
                        help='Factor de suavizado (0.1-1.0)')
     parser.add_argument('--camera', type=int, default=0, 
                        help='Índice de la cámara')
+    parser.add_argument('--cameras', default=None, metavar='INDICES',
+                       help='Varias cámaras separadas por comas (p. ej. 0,1) para fusionar')
+    parser.add_argument('--fusion', default='mejor', choices=MODOS_FUSION,
+                       help='Fusión multicámara: mejor vista o promedio ponderado por calidad de vista')
+    parser.add_argument('--preview-fps', type=float, default=15,
+                       help='FPS de la ventana de vista previa')
+    parser.add_argument('--preview-scale', type=float, default=0.5,
+                       help='Escala de la vista previa (0.1-1.0)')
+    parser.add_argument('--target-fps', type=float, default=None,
+                       help='FPS a sostener ajustando modelo, tracking y resolución de inferencia')
+    parser.add_argument('--remote', default=None, metavar='HOST:PUERTO',
+                       help='Enviar frames a un servidor de inferencia remoto (inferencia_remota.py)')
+    parser.add_argument('--remote-codec', default='jpeg', choices=['jpeg', 'raw'],
+                       help='Compresión de frames para la inferencia remota')
+    parser.add_argument('--remote-scale', type=float, default=0.5,
+                       help='Escala de los frames enviados al servidor remoto (0.1-1.0)')
+    parser.add_argument('--estado-compartido', default=None, metavar='ARCHIVO',
+                       help='Publicar el estado en un archivo mapeado en memoria (ver estado_compartido.py)')
+    parser.add_argument('--config', default=None, metavar='ARCHIVO',
+                       help='Archivo JSON de configuración que se recarga en caliente al modificarse')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Solo mostrar advertencias y errores en consola')
+    parser.add_argument('--log-level', default='INFO',
+                       choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Nivel mínimo de registro')
+    parser.add_argument('--log-json', default=None,
+                       help='Archivo JSON-lines donde guardar el registro')
     
     args = parser.parse_args()
     
     # Validar argumentos
     args.sensitivity = max(0.1, min(3.0, args.sensitivity))
     args.smoothing = max(0.1, min(1.0, args.smoothing))
+    args.preview_fps = max(1.0, args.preview_fps)
+    args.preview_scale = max(0.1, min(1.0, args.preview_scale))
     
-    print("=" * 50)
-    print("Dependencias requeridas:")
-    print("pip install opencv-python mediapipe pyautogui numpy")
-    print("=" * 50)
+    registro = RegistroAsincrono(
+        nivel=args.log_level,
+        silencioso=args.quiet,
+        ruta_json=args.log_json
+    )
     
+    registro.info("=" * 50)
+    registro.info("Dependencias requeridas:")
+    registro.info("pip install opencv-python mediapipe pyautogui numpy")
+    registro.info("=" * 50)
+    
+    observador_config = None
     try:
+        if args.config:
+            observador_config = ObservadorConfiguracion(args.config, registro)
+        
+        if args.remote and args.cameras:
+            registro.error("❌ --remote y --cameras no se pueden combinar")
+            return
+        
+        multicamara = None
+        if args.cameras:
+            multicamara = FusionMultiCamara(
+                [int(indice) for indice in args.cameras.split(',')],
+                registro, modo=args.fusion
+            )
+        
+        inferencia_remota = None
+        if args.remote:
+            host, _, puerto = args.remote.rpartition(':')
+            inferencia_remota = ClienteInferenciaRemota(
+                host, int(puerto), registro,
+                codificacion=args.remote_codec,
+                escala=max(0.1, min(1.0, args.remote_scale))
+            )
+            # Si falla, el cliente reintenta la conexión durante la ejecución
+            inferencia_remota.conectar()
+        
         controller = CameraMouseControllerAdvanzado(
             sensitivity=args.sensitivity,
-            smoothing_factor=args.smoothing
+            smoothing_factor=args.smoothing,
+            registro=registro,
+            fps_objetivo=args.target_fps,
+            preview_fps=args.preview_fps,
+            preview_escala=args.preview_scale,
+            inferencia_remota=inferencia_remota,
+            publicador_estado=PublicadorEstado(args.estado_compartido) if args.estado_compartido else None,
+            camera_index=args.camera,
+            observador_config=observador_config,
+            multicamara=multicamara
         )
         
         controller.run()
         
     except ImportError as e:
-        print(f"❌ Error de importación: {e}")
-        print("Instala las dependencias con:")
-        print("pip install opencv-python mediapipe pyautogui numpy")
+        registro.error(f"❌ Error de importación: {e}")
+        registro.error("Instala las dependencias con:")
+        registro.error("pip install opencv-python mediapipe pyautogui numpy")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        registro.error(f"❌ Error: {e}")
+    finally:
+        if observador_config is not None:
+            observador_config.cerrar()
+        registro.cerrar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from motor_gestos import GESTOS, CODIGO_GESTO
+
+# Registro de estado de tamaño fijo en un archivo mapeado en memoria:
+#   [0:8]   magic
+#   [8:12]  versión del formato
+#   [16:24] contador de secuencia (seqlock: impar = escritura en curso)
+#   [24:]   datos
+MAGIC = b'CMESTADO'
+VERSION = 1
+CABECERA = struct.Struct('<8sI')
+SECUENCIA = struct.Struct('<Q')
+OFFSET_SECUENCIA = 16
+OFFSET_DATOS = 24
+
+# timestamp, cursor x, cursor y, fps, gesto, flags, sensibilidad, suavizado
+DATOS = struct.Struct('<diifBxHff')
+TAMAÑO = OFFSET_DATOS + DATOS.size
+
+SIN_GESTO = 255
+
+# Bits del campo flags
+FLAGS = (
+    'mouse_enabled',
+    'click_mode_enabled',
+    'right_click_enabled',
+    'scroll_enabled',
+    'drag_drop_enabled',
+    'zoom_enabled',
+    'is_dragging',
+    'es_calibrado'
+)
+
+
+class PublicadorEstado:
+    def __init__(self, ruta):
+        """
+        Publica el estado del controlador en un archivo mapeado en memoria
+
+        Usa un seqlock: el contador de secuencia se hace impar antes de
+        escribir y par al terminar. El escritor nunca espera a los lectores
+        y publicar cuesta un par de `pack_into`, sin syscalls ni IPC.
+
+        El archivo nunca se trunca: un lector de una ejecución anterior
+        puede tenerlo mapeado, y acortarlo le provocaría un SIGBUS. Si ya
+        existe se reutiliza continuando su secuencia, de modo que los
+        lectores ven el primer estado nuevo como una publicación más.
+
+        Args:
+            ruta: Archivo donde publicar (se crea si no existe)
+        """
+        self.ruta = ruta
+        self._fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < TAMAÑO:
+            os.ftruncate(self._fd, TAMAÑO)
+        self.mapa = mmap.mmap(self._fd, TAMAÑO)
+
+        self.secuencia = 0
+        if CABECERA.unpack_from(self.mapa, 0) == (MAGIC, VERSION):
+            # Una secuencia impar indica que el publicador anterior terminó
+            # a mitad de una escritura: se pasa a la siguiente par
+            anterior = SECUENCIA.unpack_from(self.mapa, OFFSET_SECUENCIA)[0]
+            self.secuencia = anterior + (anterior & 1)
+            SECUENCIA.pack_into(self.mapa, OFFSET_SECUENCIA, self.secuencia)
+        else:
+            CABECERA.pack_into(self.mapa, 0, MAGIC, VERSION)
+
+    def publicar(self, cursor_x, cursor_y, fps, gesto, flags, sensibilidad, suavizado):
+        """
+        Escribe un nuevo estado
+
+        Args:
+            gesto: Nombre del gesto actual o None
+            flags: Entero con los bits de FLAGS (ver calcular_flags)
+        """
+        codigo = CODIGO_GESTO.get(gesto, SIN_GESTO) if gesto else SIN_GESTO
+
+        self.secuencia += 1
+        SECUENCIA.pack_into(self.mapa, OFFSET_SECUENCIA, self.secuencia)
+        DATOS.pack_into(self.mapa, OFFSET_DATOS, time.time(), int(cursor_x), int(cursor_y),
+                        fps, codigo, flags, sensibilidad, suavizado)
+        self.secuencia += 1
+        SECUENCIA.pack_into(self.mapa, OFFSET_SECUENCIA, self.secuencia)
+
+    def cerrar(self):
+        """Libera el mapa (el archivo queda con el último estado)"""
+        self.mapa.close()
+        os.close(self._fd)
+
+
+def calcular_flags(objeto):
+    """Empaqueta los atributos booleanos de FLAGS de un objeto en un entero"""
+    flags = 0
+    for bit, nombre in enumerate(FLAGS):
+        if getattr(objeto, nombre, False):
+            flags |= 1 << bit
+    return flags
+
+
+class LectorEstado:
+    def __init__(self, ruta):
+        """Lee el estado publicado por PublicadorEstado desde otro proceso"""
+        self._archivo = open(ruta, 'rb')
+        self.mapa = mmap.mmap(self._archivo.fileno(), TAMAÑO, access=mmap.ACCESS_READ)
+
+        magic, version = CABECERA.unpack_from(self.mapa, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{ruta} no es un archivo de estado válido (versión {VERSION})")
+
+    def leer(self, timeout=0.1):
+        """
+        Lee una copia consistente del estado
+
+        Reintenta si la secuencia es impar (escritura en curso) o cambió
+        durante la lectura. Tras unos reintentos cede la CPU, por si el
+        escritor quedó desplazado a mitad de una escritura.
+
+        Returns:
+            dict con el estado, o None si todavía no se publicó nada
+        """
+        limite = time.monotonic() + timeout
+        intentos = 0
+        while True:
+            antes = SECUENCIA.unpack_from(self.mapa, OFFSET_SECUENCIA)[0]
+            if not antes & 1:
+                datos = DATOS.unpack_from(self.mapa, OFFSET_DATOS)
+                despues = SECUENCIA.unpack_from(self.mapa, OFFSET_SECUENCIA)[0]
+                if antes == despues:
+                    break
+
+            intentos += 1
+            if intentos > 10:
+                if time.monotonic() > limite:
+                    raise RuntimeError("No se pudo obtener una lectura consistente del estado "
+                                       "(¿el controlador terminó a mitad de una escritura?)")
+                time.sleep(0.0001)
+
+        if antes == 0:
+            return None
+
+        marca, cursor_x, cursor_y, fps, codigo, flags, sensibilidad, suavizado = datos
+        estado = {
+            'secuencia': antes // 2,
+            'timestamp': marca,
+            'edad_ms': (time.time() - marca) * 1000,
+            'cursor': (cursor_x, cursor_y),
+            'fps': fps,
+            'gesto': GESTOS[codigo] if codigo < len(GESTOS) else None,
+            'sensitivity': sensibilidad,
+            'smoothing_factor': suavizado
+        }
+        for bit, nombre in enumerate(FLAGS):
+            estado[nombre] = bool(flags & (1 << bit))
+        return estado
+
+    def cerrar(self):
+        self.mapa.close()
+        self._archivo.close()
+
+
+def mostrar_estado(estado, como_json):
+    """Imprime una lectura del estado"""
+    if estado is None:
+        print("⏳ Sin estado publicado todavía")
+    elif como_json:
+        print(json.dumps(estado, ensure_ascii=False), flush=True)
+    else:
+        activas = [nombre for nombre in FLAGS if estado[nombre]]
+        print(f"#{estado['secuencia']} ({estado['edad_ms']:.0f} ms) "
+              f"Cursor: {estado['cursor']} | FPS: {estado['fps']:.1f} | "
+              f"Gesto: {estado['gesto']} | {', '.join(activas)}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lector del estado compartido del control de mouse')
+    parser.add_argument('ruta',
+                       help='Archivo de estado (--estado-compartido del controlador)')
+    parser.add_argument('--intervalo', type=float, default=0.5,
+                       help='Segundos entre lecturas')
+    parser.add_argument('--json', action='store_true',
+                       help='Imprimir cada lectura como una línea JSON')
+    parser.add_argument('--una-vez', action='store_true',
+                       help='Leer una sola vez y salir')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.ruta):
+        print(f"❌ No existe el archivo de estado: {args.ruta}")
+        sys.exit(1)
+
+    lector = LectorEstado(args.ruta)
+    try:
+        while True:
+            try:
+                estado = lector.leer()
+            except RuntimeError as e:
+                print(f"⚠️ {e}")
+            else:
+                mostrar_estado(estado, args.json)
+
+            if args.una_vez:
+                break
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lector.cerrar()
+
+
+if __name__ == "__main__":
+    main()
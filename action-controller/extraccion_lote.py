@@ -0,0 +1,399 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+import motor_gestos
+from registro import RegistroAsincrono
+
+EXTENSIONES_VIDEO = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Código de gesto para frames sin mano detectada
+SIN_MANO = 255
+
+# Parámetros con los que se escribieron las partes de un video a medias
+ARCHIVO_PARAMETROS = 'parametros.json'
+
+# Columnas de cada parte: un array por columna, alineados por frame
+COLUMNAS = ('frame', 'tiempo_ms', 'detectado', 'puntuacion', 'landmarks', 'gesto')
+
+# Hands del proceso worker (uno por proceso, creado en el inicializador)
+_hands = None
+_parametros_hands = None
+
+
+def _iniciar_worker(model_complexity, min_detection_confidence, min_tracking_confidence):
+    """Crea la instancia de MediaPipe Hands de este worker"""
+    global _parametros_hands
+
+    cv2.setNumThreads(1)
+    _parametros_hands = {
+        'model_complexity': model_complexity,
+        'min_detection_confidence': min_detection_confidence,
+        'min_tracking_confidence': min_tracking_confidence
+    }
+    _crear_hands()
+
+
+def _crear_hands():
+    """(Re)construye el grafo de Hands del worker"""
+    global _hands
+    import mediapipe as mp
+
+    _hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, **_parametros_hands)
+
+
+def _reiniciar_tracking():
+    """
+    Olvida el tracking del video anterior
+
+    El mismo worker procesa varios videos; sin reiniciar, los primeros
+    frames de un video dependerían de cómo terminó el anterior y el
+    resultado cambiaría según el reparto del pool.
+    """
+    if hasattr(_hands, 'reset'):
+        _hands.reset()
+    else:
+        _hands.close()
+        _crear_hands()
+
+
+def buscar_videos(directorio):
+    """Lista los videos del directorio (recursivo), ordenados"""
+    videos = []
+    for ruta in glob.glob(os.path.join(directorio, '**', '*'), recursive=True):
+        if os.path.isfile(ruta) and ruta.lower().endswith(EXTENSIONES_VIDEO):
+            videos.append(ruta)
+    return sorted(videos)
+
+
+def directorio_salida(directorio_videos, ruta_video, salida):
+    """Directorio de resultados de un video (su ruta relativa, aplanada)"""
+    relativa = os.path.splitext(os.path.relpath(ruta_video, directorio_videos))[0]
+    return os.path.join(salida, relativa.replace(os.sep, '__'))
+
+
+def partes_completas(destino):
+    """Partes ya escritas de un video, en orden"""
+    if not os.path.isdir(destino):
+        return []
+    return sorted(nombre for nombre in os.listdir(destino)
+                  if re.fullmatch(r'parte_\d{5}\.npz', nombre))
+
+
+def frames_por_parte_previo(destino):
+    """
+    Tamaño de parte con el que se escribieron las partes existentes
+
+    Returns:
+        Frames por parte, o None si el video no tiene partes
+    """
+    partes = partes_completas(destino)
+    if not partes:
+        return None
+    ruta = os.path.join(destino, ARCHIVO_PARAMETROS)
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)['frames_por_parte']
+    # Sin parámetros guardados: mientras no hay manifiesto todas las partes
+    # están completas, así que la primera tiene el tamaño de parte
+    with np.load(os.path.join(destino, partes[0])) as parte:
+        return len(parte['frame'])
+
+
+def guardar_parte(destino, indice, columnas):
+    """Escribe una parte de forma atómica (un archivo incompleto nunca cuenta como hecho)"""
+    ruta = os.path.join(destino, f'parte_{indice:05d}.npz')
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as f:
+        np.savez(f, **columnas)
+    os.replace(temporal, ruta)
+
+
+def procesar_video(ruta, destino, frames_por_parte, umbral_pinza, espejo, cola):
+    """
+    Extrae landmarks y gestos de un video en el worker actual
+
+    El video se escribe en partes de `frames_por_parte` frames. Si ya hay
+    partes de una ejecución anterior, se continúa desde el primer frame
+    que falta; el tamaño de parte tiene que ser el mismo con el que se
+    escribieron.
+
+    Returns:
+        (frames procesados en esta ejecución, segundos)
+    """
+    os.makedirs(destino, exist_ok=True)
+    previo = frames_por_parte_previo(destino)
+    if previo is None:
+        with open(os.path.join(destino, ARCHIVO_PARAMETROS), 'w', encoding='utf-8') as f:
+            json.dump({'frames_por_parte': frames_por_parte}, f)
+    elif previo != frames_por_parte:
+        raise RuntimeError(f"{destino} tiene partes de {previo} frames: reanuda con "
+                           f"--frames-por-parte {previo} o borra el directorio")
+    parte = len(partes_completas(destino))
+    inicio_frame = parte * frames_por_parte
+
+    cap = cv2.VideoCapture(ruta)
+    if not cap.isOpened():
+        raise RuntimeError(f"No se puede abrir el video {ruta}")
+    _reiniciar_tracking()
+    fps_video = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if inicio_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, inicio_frame)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != inicio_frame:
+            # El seek de algunos códecs cae en el keyframe anterior: se
+            # reabre el video y se avanza frame a frame sin decodificar
+            cap.release()
+            cap = cv2.VideoCapture(ruta)
+            for _ in range(inicio_frame):
+                if not cap.grab():
+                    raise RuntimeError(f"{ruta} termina antes del frame {inicio_frame}")
+
+    # Buffers de una parte, reutilizados entre partes
+    landmarks = np.zeros((frames_por_parte, 21, 3), dtype=np.float32)
+    detectado = np.zeros(frames_por_parte, dtype=bool)
+    puntuacion = np.zeros(frames_por_parte, dtype=np.float32)
+
+    pid = os.getpid()
+    nombre = os.path.basename(ruta)
+    inicio = time.perf_counter()
+    ultimo_reporte = inicio
+    procesados = 0
+    reportados = 0
+    n = 0
+    frame_actual = inicio_frame
+
+    def cerrar_parte():
+        nonlocal parte, n
+        gestos = np.full(n, SIN_MANO, dtype=np.uint8)
+        if detectado[:n].any():
+            gestos[detectado[:n]] = motor_gestos.clasificar_gestos_lote(
+                landmarks[:n][detectado[:n]], umbral_pinza)
+        frames = np.arange(frame_actual - n, frame_actual, dtype=np.int64)
+        guardar_parte(destino, parte, {
+            'frame': frames,
+            'tiempo_ms': frames * (1000.0 / fps_video),
+            'detectado': detectado[:n].copy(),
+            'puntuacion': puntuacion[:n].copy(),
+            'landmarks': landmarks[:n].copy(),
+            'gesto': gestos
+        })
+        parte += 1
+        n = 0
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        if espejo:
+            frame = cv2.flip(frame, 1)
+        results = _hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        if results.multi_hand_landmarks:
+            landmarks[n] = motor_gestos.landmarks_a_array(results.multi_hand_landmarks[0].landmark)
+            detectado[n] = True
+            puntuacion[n] = results.multi_handedness[0].classification[0].score
+        else:
+            # Los buffers se reutilizan: sin mano se escriben ceros para no
+            # arrastrar valores de la parte anterior
+            landmarks[n] = 0.0
+            detectado[n] = False
+            puntuacion[n] = 0.0
+        n += 1
+        frame_actual += 1
+        procesados += 1
+
+        if n == frames_por_parte:
+            cerrar_parte()
+
+        ahora = time.perf_counter()
+        if ahora - ultimo_reporte >= 1.0:
+            cola.put((pid, nombre, frame_actual, total, procesados / (ahora - inicio),
+                      procesados - reportados))
+            reportados = procesados
+            ultimo_reporte = ahora
+
+    if n:
+        cerrar_parte()
+    cap.release()
+
+    # El manifiesto se escribe al final: su presencia marca el video como terminado
+    with open(os.path.join(destino, 'manifiesto.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'video': ruta,
+            'frames': frame_actual,
+            'fps': fps_video,
+            'partes': parte,
+            'columnas': COLUMNAS,
+            'gestos': motor_gestos.GESTOS,
+            'sin_mano': SIN_MANO,
+            'espejo': espejo,
+            'umbral_pinza': umbral_pinza
+        }, f, ensure_ascii=False, indent=2)
+
+    segundos = time.perf_counter() - inicio
+    cola.put((pid, nombre, frame_actual, total, procesados / segundos if segundos > 0 else 0.0,
+              procesados - reportados))
+    return procesados, segundos
+
+
+def cargar_resultados(destino):
+    """
+    Carga las columnas de un video procesado, concatenando sus partes
+
+    Returns:
+        dict columna -> array
+    """
+    columnas = {nombre: [] for nombre in COLUMNAS}
+    for nombre_parte in partes_completas(destino):
+        with np.load(os.path.join(destino, nombre_parte)) as parte:
+            for nombre in COLUMNAS:
+                columnas[nombre].append(parte[nombre])
+    return {nombre: np.concatenate(arrays) if arrays else np.empty(0)
+            for nombre, arrays in columnas.items()}
+
+
+def mostrar_progreso(registro, estado_workers, frames_totales, frames_previos, inicio):
+    """Registra el progreso global y el de cada worker"""
+    hechos = frames_previos + sum(estado['hechos'] for estado in estado_workers.values())
+    transcurrido = time.perf_counter() - inicio
+    porcentaje = 100.0 * hechos / frames_totales if frames_totales else 0.0
+    registro.info("📊 %d/%d frames (%.1f%%) en %.0fs", hechos, frames_totales, porcentaje,
+                  transcurrido, evento='progreso', frames=hechos, total=frames_totales)
+    for pid, estado in sorted(estado_workers.items()):
+        registro.info("   worker %d: %s %d/%d frames, %.1f FPS", pid, estado['video'],
+                      estado['frame'], estado['total'], estado['fps'],
+                      evento='progreso_worker', worker=pid, video=estado['video'], fps=estado['fps'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extracción de landmarks por lotes sobre directorios de video')
+    parser.add_argument('videos',
+                       help='Directorio con los videos (se recorre recursivamente)')
+    parser.add_argument('salida',
+                       help='Directorio donde escribir los resultados')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                       help='Procesos en paralelo (cada uno con su instancia de Hands)')
+    parser.add_argument('--frames-por-parte', type=int, default=3000,
+                       help='Frames por archivo de resultados (granularidad de la reanudación)')
+    parser.add_argument('--model-complexity', type=int, default=1, choices=[0, 1],
+                       help='Complejidad del modelo de MediaPipe')
+    parser.add_argument('--min-detection-confidence', type=float, default=0.8,
+                       help='Confianza mínima de detección')
+    parser.add_argument('--min-tracking-confidence', type=float, default=0.7,
+                       help='Confianza mínima de tracking')
+    parser.add_argument('--umbral-pinza', type=float, default=0.03,
+                       help='Umbral de pinza para las etiquetas de gesto')
+    parser.add_argument('--espejo', action='store_true',
+                       help='Voltear los frames como hace el controlador en vivo')
+    parser.add_argument('--intervalo', type=float, default=5.0,
+                       help='Segundos entre reportes de progreso')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Solo mostrar advertencias y errores en consola')
+    args = parser.parse_args()
+
+    registro = RegistroAsincrono(silencioso=args.quiet)
+    try:
+        videos = buscar_videos(args.videos)
+        if not videos:
+            registro.error(f"❌ No hay videos en {args.videos}")
+            return
+
+        # Los videos con manifiesto ya están terminados; del resto se
+        # cuentan los frames ya escritos para el progreso global
+        pendientes = []
+        frames_totales = 0
+        frames_previos = 0
+        for ruta in videos:
+            destino = directorio_salida(args.videos, ruta, args.salida)
+            cap = cv2.VideoCapture(ruta)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            frames_totales += total
+
+            if os.path.exists(os.path.join(destino, 'manifiesto.json')):
+                frames_previos += total
+                continue
+            frames_por_parte = frames_por_parte_previo(destino) or args.frames_por_parte
+            frames_previos += min(total, len(partes_completas(destino)) * frames_por_parte)
+            pendientes.append((ruta, destino))
+
+        registro.info(f"🎞️ {len(videos)} videos, {len(videos) - len(pendientes)} ya procesados, "
+                      f"{len(pendientes)} pendientes con {args.workers} workers")
+        if not pendientes:
+            return
+
+        # spawn: MediaPipe no es seguro tras fork
+        contexto = multiprocessing.get_context('spawn')
+        gestor = contexto.Manager()
+        cola = gestor.Queue()
+
+        estado_workers = {}
+        frames_procesados = 0
+        errores = 0
+        inicio = time.perf_counter()
+        proximo_reporte = inicio + args.intervalo
+
+        with ProcessPoolExecutor(
+                max_workers=args.workers, mp_context=contexto, initializer=_iniciar_worker,
+                initargs=(args.model_complexity, args.min_detection_confidence,
+                          args.min_tracking_confidence)) as pool:
+            futuros = {
+                pool.submit(procesar_video, ruta, destino, args.frames_por_parte,
+                            args.umbral_pinza, args.espejo, cola): ruta
+                for ruta, destino in pendientes
+            }
+            pendientes_futuros = set(futuros)
+
+            while pendientes_futuros:
+                try:
+                    pid, video, frame, total, fps, nuevos = cola.get(timeout=0.5)
+                    hechos = estado_workers[pid]['hechos'] if pid in estado_workers else 0
+                    estado_workers[pid] = {'video': video, 'frame': frame, 'total': total,
+                                           'fps': fps, 'hechos': hechos + nuevos}
+                except queue.Empty:
+                    pass
+
+                for futuro in [f for f in pendientes_futuros if f.done()]:
+                    pendientes_futuros.discard(futuro)
+                    ruta = futuros[futuro]
+                    try:
+                        procesados, segundos = futuro.result()
+                    except Exception as e:
+                        errores += 1
+                        registro.error(f"❌ {ruta}: {e}", evento='video_error', video=ruta)
+                        continue
+                    frames_procesados += procesados
+                    registro.info("✅ %s: %d frames en %.1fs (%.1f FPS)", os.path.basename(ruta),
+                                  procesados, segundos, procesados / segundos if segundos > 0 else 0.0,
+                                  evento='video_completo', video=ruta, frames=procesados)
+
+                ahora = time.perf_counter()
+                if ahora >= proximo_reporte:
+                    mostrar_progreso(registro, estado_workers, frames_totales, frames_previos, inicio)
+                    proximo_reporte = ahora + args.intervalo
+
+        gestor.shutdown()
+
+        transcurrido = time.perf_counter() - inicio
+        registro.info("🏁 %d frames en %.1fs (%.1f FPS totales), %d errores", frames_procesados,
+                      transcurrido, frames_procesados / transcurrido if transcurrido > 0 else 0.0,
+                      errores, evento='fin', frames=frames_procesados, errores=errores)
+    except KeyboardInterrupt:
+        registro.info("\n🛑 Interrumpido: las partes ya escritas se conservan para reanudar")
+    finally:
+        registro.cerrar()
+
+
+if __name__ == "__main__":
+    main()
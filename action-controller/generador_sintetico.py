@@ -0,0 +1,160 @@
+import numpy as np
+
+from motor_gestos import array_a_landmarks
+
+# Gestos que sabe generar (mismos nombres que analizar_gesto_mano)
+GESTOS_SINTETICOS = ('apuntar', 'pinza', 'click_derecho', 'scroll', 'zoom', 'puño', 'abierta')
+
+# Índices de landmarks de MediaPipe por dedo: (mcp, pip, dip, tip)
+DEDOS = {
+    'indice': (5, 6, 7, 8),
+    'medio': (9, 10, 11, 12),
+    'anular': (13, 14, 15, 16),
+    'meñique': (17, 18, 19, 20)
+}
+
+# Posición X de cada dedo en la pose canónica (el pulgar apunta hacia +X)
+X_DEDOS = {'indice': 0.56, 'medio': 0.50, 'anular': 0.44, 'meñique': 0.38}
+
+# Dedos extendidos por gesto
+DEDOS_POR_GESTO = {
+    'apuntar': {'indice'},
+    'click_derecho': {'pulgar', 'indice'},
+    'scroll': {'indice', 'medio'},
+    'zoom': {'indice', 'medio', 'anular'},
+    'puño': set(),
+    'abierta': {'pulgar', 'indice', 'medio', 'anular', 'meñique'},
+    'pinza': {'medio', 'anular', 'meñique'}
+}
+
+
+def pose_base(gesto):
+    """
+    Genera la pose canónica (21, 3) de un gesto
+
+    Las coordenadas son normalizadas como las de MediaPipe (0-1, Y hacia
+    abajo) y están construidas para que analizar_gesto_mano las clasifique
+    como `gesto` sin ruido ni rotación.
+    """
+    if gesto not in DEDOS_POR_GESTO:
+        raise ValueError(f"Gesto desconocido: {gesto}")
+
+    extendidos = DEDOS_POR_GESTO[gesto]
+    pose = np.zeros((21, 3), dtype=np.float64)
+
+    # Muñeca
+    pose[0] = (0.50, 0.80, 0.0)
+
+    # Pulgar: cmc, mcp, ip, tip
+    if gesto == 'pinza':
+        pose[1:5] = [(0.58, 0.75, -0.01), (0.63, 0.68, -0.02),
+                     (0.65, 0.58, -0.03), (0.61, 0.51, -0.03)]
+    elif 'pulgar' in extendidos:
+        pose[1:5] = [(0.58, 0.75, -0.01), (0.64, 0.70, -0.02),
+                     (0.69, 0.66, -0.03), (0.74, 0.63, -0.03)]
+    else:
+        pose[1:5] = [(0.58, 0.75, -0.01), (0.62, 0.70, -0.02),
+                     (0.60, 0.64, -0.03), (0.52, 0.57, -0.03)]
+
+    # Resto de dedos
+    for dedo, (mcp, pip, dip, tip) in DEDOS.items():
+        x = X_DEDOS[dedo]
+        pose[mcp] = (x, 0.60, -0.01)
+        if gesto == 'pinza' and dedo == 'indice':
+            # Índice flexionado hasta tocar la punta del pulgar
+            pose[pip] = (0.58, 0.52, -0.03)
+            pose[dip] = (0.60, 0.49, -0.04)
+            pose[tip] = (0.61, 0.50, -0.04)
+        elif dedo in extendidos:
+            pose[pip] = (x, 0.50, -0.02)
+            pose[dip] = (x, 0.45, -0.03)
+            pose[tip] = (x, 0.40, -0.03)
+        else:
+            pose[pip] = (x, 0.55, -0.03)
+            pose[dip] = (x, 0.60, -0.03)
+            pose[tip] = (x, 0.64, -0.02)
+
+    return pose
+
+
+def transformar_pose(pose, rotacion=0.0, escala=1.0, traslacion=(0.0, 0.0)):
+    """
+    Rota (grados, en el plano de la imagen) y escala la pose alrededor del
+    centro de la palma y luego la traslada
+    """
+    centro = pose[9, :2]
+    angulo = np.deg2rad(rotacion)
+    cos_a, sin_a = np.cos(angulo), np.sin(angulo)
+    matriz = np.array([[cos_a, -sin_a], [sin_a, cos_a]]) * escala
+
+    resultado = pose.copy()
+    resultado[:, :2] = (pose[:, :2] - centro) @ matriz.T + centro + np.asarray(traslacion)
+    resultado[:, 2] *= escala
+    return resultado
+
+
+def generar_poses(gesto, n, ruido=0.002, rotacion_max=0.0, escala=(1.0, 1.0),
+                  traslacion_max=0.0, semilla=None):
+    """
+    Genera n poses independientes de un gesto
+
+    Args:
+        gesto: Nombre del gesto (ver GESTOS_SINTETICOS)
+        n: Número de poses
+        ruido: Desviación estándar del ruido gaussiano por coordenada
+        rotacion_max: Rotación uniforme en [-rotacion_max, rotacion_max] grados
+        escala: Rango (min, max) del factor de escala de la mano
+        traslacion_max: Desplazamiento uniforme máximo en X e Y
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Array (n, 21, 3)
+    """
+    rng = np.random.default_rng(semilla)
+    base = pose_base(gesto)
+    poses = np.empty((n, 21, 3), dtype=np.float64)
+
+    for i in range(n):
+        poses[i] = transformar_pose(
+            base,
+            rotacion=rng.uniform(-rotacion_max, rotacion_max),
+            escala=rng.uniform(*escala),
+            traslacion=rng.uniform(-traslacion_max, traslacion_max, size=2)
+        )
+
+    if ruido > 0:
+        poses += rng.normal(0.0, ruido, size=poses.shape)
+    return poses
+
+
+def generar_trayectoria(gesto, n, amplitud=0.15, periodo=60, ruido=0.001, semilla=None):
+    """
+    Genera una secuencia temporal (n, 21, 3) con el movimiento típico del gesto
+
+    - scroll: la mano sube y baja (movimiento vertical)
+    - zoom: índice y anular se abren y cierran
+    - resto: el índice recorre una figura de Lissajous (movimiento de cursor)
+    """
+    rng = np.random.default_rng(semilla)
+    base = pose_base(gesto)
+    t = np.arange(n) * (2 * np.pi / periodo)
+    poses = np.repeat(base[np.newaxis], n, axis=0)
+
+    if gesto == 'scroll':
+        poses[:, :, 1] += (amplitud * np.sin(t))[:, np.newaxis]
+    elif gesto == 'zoom':
+        apertura = amplitud * 0.3 * np.sin(t)
+        poses[:, 8, 0] += apertura
+        poses[:, 16, 0] -= apertura
+    else:
+        poses[:, :, 0] += (amplitud * np.sin(t))[:, np.newaxis]
+        poses[:, :, 1] += (amplitud * 0.6 * np.sin(2 * t))[:, np.newaxis]
+
+    if ruido > 0:
+        poses += rng.normal(0.0, ruido, size=poses.shape)
+    return poses
+
+
+def a_landmarks(pose):
+    """Convierte una pose (21, 3) en un objeto con la interfaz de MediaPipe"""
+    return array_a_landmarks(pose)
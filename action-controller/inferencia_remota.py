@@ -0,0 +1,668 @@
+import argparse
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+
+import cv2
+import numpy as np
+
+from motor_gestos import array_a_landmarks
+from registro import RegistroAsincrono
+
+# Mensaje de frame (cliente -> servidor):
+#   magic, secuencia, t_envio, codificación, ancho, alto, bytes de payload
+CABECERA_FRAME = struct.Struct('<4sIdBHHI')
+MAGIC_FRAME = b'CMF1'
+
+# Mensaje de resultado (servidor -> cliente):
+#   magic, secuencia, t_envio (eco), ms de inferencia, número de manos
+#   seguido de num_manos * (puntuación + 21 * 3) float32
+CABECERA_RESULTADO = struct.Struct('<4sIdfB')
+MAGIC_RESULTADO = b'CMR1'
+FLOATS_POR_MANO = 1 + 21 * 3
+
+CODIFICACIONES = {'jpeg': 0, 'raw': 1}
+
+# Mayor frame que acepta el servidor (4K RGB): el tamaño viene del cliente
+# y no se puede reservar memoria a ciegas
+MAX_BYTES_FRAME = 3840 * 2160 * 3
+
+
+class ResultadosRemotos:
+    """Resultado con la misma interfaz que el de Hands.process"""
+    __slots__ = ('multi_hand_landmarks', 'puntuaciones')
+
+    def __init__(self, manos=None, puntuaciones=None):
+        self.multi_hand_landmarks = manos or None
+        self.puntuaciones = puntuaciones or []
+
+
+def recibir_exacto(conexion, n):
+    """Lee exactamente n bytes del socket (None si se cerró la conexión)"""
+    buffer = bytearray(n)
+    vista = memoryview(buffer)
+    leidos = 0
+    while leidos < n:
+        recibidos = conexion.recv_into(vista[leidos:], n - leidos)
+        if recibidos == 0:
+            return None
+        leidos += recibidos
+    return buffer
+
+
+def codificar_frame(rgb_frame, codificacion, calidad_jpeg):
+    """Comprime un frame para enviarlo por la red"""
+    if codificacion == 'jpeg':
+        # Se codifica el array RGB tal cual: el servidor lo decodifica con el
+        # mismo orden de canales y lo pasa a MediaPipe sin convertir color
+        ok, datos = cv2.imencode('.jpg', rgb_frame, [cv2.IMWRITE_JPEG_QUALITY, calidad_jpeg])
+        if not ok:
+            raise ValueError("No se pudo codificar el frame en JPEG")
+        return datos.tobytes()
+    return zlib.compress(np.ascontiguousarray(rgb_frame).tobytes(), 1)
+
+
+def tamaño_payload_maximo(codigo, ancho, alto):
+    """
+    Bytes máximos aceptables para el payload de un frame
+
+    Returns:
+        Límite en bytes, o 0 si la cabecera no es válida
+    """
+    bytes_frame = ancho * alto * 3
+    if codigo not in CODIFICACIONES.values() or not 0 < bytes_frame <= MAX_BYTES_FRAME:
+        return 0
+    # zlib y JPEG pueden crecer algo sobre datos incompresibles (ruido)
+    return bytes_frame + bytes_frame // 100 + 1024
+
+
+def dimensiones_jpeg(datos):
+    """(ancho, alto) según el marcador SOF de un JPEG, o None si no se encuentra"""
+    i = 2
+    while i + 9 <= len(datos):
+        if datos[i] != 0xFF:
+            return None
+        marcador = datos[i + 1]
+        if marcador == 0xFF:
+            i += 1
+            continue
+        # SOF0..SOF15 salvo DHT (C4), JPG (C8) y DAC (CC)
+        if 0xC0 <= marcador <= 0xCF and marcador not in (0xC4, 0xC8, 0xCC):
+            alto = int.from_bytes(datos[i + 5:i + 7], 'big')
+            ancho = int.from_bytes(datos[i + 7:i + 9], 'big')
+            return ancho, alto
+        i += 2 + int.from_bytes(datos[i + 2:i + 4], 'big')
+    return None
+
+
+def decodificar_frame(codigo, ancho, alto, payload):
+    """
+    Inverso de codificar_frame
+
+    Nunca produce más de ancho * alto * 3 bytes, aunque el payload diga
+    otra cosa (JPEG con otras dimensiones, bomba zlib).
+
+    Raises:
+        ValueError si el payload no corresponde a un frame de ancho x alto
+    """
+    if codigo == CODIFICACIONES['jpeg']:
+        if dimensiones_jpeg(payload) != (ancho, alto):
+            raise ValueError(f"JPEG con dimensiones distintas de {ancho}x{alto}")
+        frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("JPEG inválido")
+        return frame
+
+    bytes_frame = ancho * alto * 3
+    descompresor = zlib.decompressobj()
+    try:
+        datos = descompresor.decompress(payload, bytes_frame)
+    except zlib.error as e:
+        raise ValueError(f"payload zlib inválido: {e}")
+    if len(datos) != bytes_frame or descompresor.unconsumed_tail:
+        raise ValueError(f"payload raw que no mide {ancho}x{alto}x3")
+    return np.frombuffer(datos, dtype=np.uint8).reshape(alto, ancho, 3)
+
+
+class ClienteInferenciaRemota:
+    def __init__(self, host, port, registro, codificacion='jpeg', calidad_jpeg=80,
+                 escala=0.5, max_en_vuelo=2, timeout_respuesta=1.0, intervalo_estadisticas=5.0):
+        """
+        Envía frames a un servidor de inferencia y recibe los landmarks
+
+        Se usa en lugar de MediaPipe Hands: `process` tiene la misma firma,
+        pero nunca espera a la red. Si hay hueco en la ventana de frames en
+        vuelo deja el frame en un buzón de una sola plaza (si no, lo
+        descarta) y devuelve el último resultado recibido. Un hilo emisor
+        toma el frame más reciente del buzón, lo codifica y lo envía, así
+        un frame grande o una red lenta nunca frenan el loop de visión; los
+        frames que se acumulan mientras tanto se reemplazan. Un hilo receptor lee las respuestas, descarta
+        las que lleguen fuera de orden y mide el tiempo de ida y vuelta.
+        Si un frame enviado no tiene respuesta en `timeout_respuesta`
+        segundos (servidor colgado o red que pierde tráfico), se desconecta
+        para no seguir devolviendo una mano congelada. La reconexión se
+        hace en un hilo aparte.
+
+        Args:
+            host, port: Dirección del servidor de inferencia
+            registro: RegistroAsincrono para estado y estadísticas
+            codificacion: 'jpeg' o 'raw' (raw reducido y comprimido con zlib)
+            calidad_jpeg: Calidad JPEG (0-100)
+            escala: Escala del frame antes de enviarlo
+            max_en_vuelo: Frames enviados sin respuesta antes de descartar
+            timeout_respuesta: Segundos máximos de espera por una respuesta
+            intervalo_estadisticas: Segundos entre reportes de latencia
+        """
+        if codificacion not in CODIFICACIONES:
+            raise ValueError(f"Codificación desconocida: {codificacion}")
+
+        self.direccion = (host, port)
+        self.log = registro
+        self.codificacion = codificacion
+        self.calidad_jpeg = calidad_jpeg
+        self.escala = escala
+        self.max_en_vuelo = max_en_vuelo
+        self.timeout_respuesta = timeout_respuesta
+        self.intervalo_estadisticas = intervalo_estadisticas
+
+        self.socket = None
+        self.conectado = False
+        self.cerrado = False
+        self.ultimo_intento = 0.0
+        self._hilo = None
+        self._hilo_reconexion = None
+
+        self.secuencia = 0
+        self.ultima_secuencia_recibida = -1
+        # Frames en vuelo: {secuencia: momento de envío}
+        self.en_vuelo = {}
+        self._lock = threading.Lock()
+        self.ultimo_resultado = ResultadosRemotos()
+
+        # Buzón del hilo emisor: solo el frame más reciente
+        self._buzon = None
+        self._hay_frame = threading.Condition()
+        self._hilo_emisor = threading.Thread(target=self._bucle_emisor,
+                                             name='inferencia-remota-emisor', daemon=True)
+        self._hilo_emisor.start()
+
+        # Estadísticas
+        self.rtts = deque(maxlen=200)
+        self.inferencias = deque(maxlen=200)
+        self.enviados = 0
+        self.descartados = 0
+        self.timeouts = 0
+        self.bytes_enviados = 0
+        self.ultimo_reporte = time.time()
+
+    def conectar(self, timeout=2.0):
+        """Abre la conexión con el servidor; devuelve True si tuvo éxito"""
+        self.ultimo_intento = time.time()
+        try:
+            conexion = socket.create_connection(self.direccion, timeout=timeout)
+        except OSError as e:
+            self.log.error(f"❌ No se puede conectar al servidor de inferencia {self.direccion}: {e}")
+            return False
+
+        conexion.settimeout(None)
+        conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket = conexion
+        with self._lock:
+            self.en_vuelo.clear()
+        self.conectado = True
+
+        self._hilo = threading.Thread(target=self._bucle_receptor, args=(conexion,),
+                                      name='inferencia-remota', daemon=True)
+        self._hilo.start()
+        self.log.info("🌐 Conectado al servidor de inferencia %s:%d", *self.direccion,
+                      evento='remoto_conectado')
+        return True
+
+    def process(self, rgb_frame):
+        """
+        Envía el frame si la ventana lo permite y devuelve el último resultado
+
+        Args:
+            rgb_frame: Frame RGB (misma entrada que Hands.process)
+        """
+        if not self.conectado:
+            self._reconectar_en_segundo_plano()
+            return self.ultimo_resultado
+
+        ahora = time.time()
+        with self._lock:
+            mas_antiguo = min(self.en_vuelo.values()) if self.en_vuelo else ahora
+        if ahora - mas_antiguo > self.timeout_respuesta:
+            self.timeouts += 1
+            self._desconectar(f"sin respuesta en {self.timeout_respuesta:.1f}s")
+            return self.ultimo_resultado
+
+        with self._lock:
+            hay_hueco = len(self.en_vuelo) < self.max_en_vuelo
+
+        if not hay_hueco:
+            self.descartados += 1
+        else:
+            with self._hay_frame:
+                if self._buzon is not None:
+                    # El emisor no llegó a tomar el anterior: se reemplaza
+                    self.descartados += 1
+                self._buzon = rgb_frame
+                self._hay_frame.notify()
+
+        self._reportar_estadisticas()
+        return self.ultimo_resultado
+
+    def _reconectar_en_segundo_plano(self):
+        """Arranca el hilo de reconexión si no está en marcha"""
+        if self.cerrado or (self._hilo_reconexion is not None and self._hilo_reconexion.is_alive()):
+            return
+        self._hilo_reconexion = threading.Thread(target=self._bucle_reconexion,
+                                                 name='inferencia-remota-reconexion', daemon=True)
+        self._hilo_reconexion.start()
+
+    def _bucle_reconexion(self):
+        """Reintenta la conexión como mucho cada 2 segundos"""
+        while not self.conectado and not self.cerrado:
+            espera = 2.0 - (time.time() - self.ultimo_intento)
+            if espera > 0:
+                time.sleep(espera)
+                continue
+            self.conectar()
+
+    def _bucle_emisor(self):
+        """Hilo que envía el frame más reciente del buzón"""
+        while True:
+            with self._hay_frame:
+                self._hay_frame.wait_for(lambda: self._buzon is not None or self.cerrado)
+                if self.cerrado:
+                    return
+                rgb_frame, self._buzon = self._buzon, None
+            if self.conectado:
+                self._enviar(rgb_frame)
+
+    def _enviar(self, rgb_frame):
+        """Codifica y envía un frame (en el hilo emisor)"""
+        conexion = self.socket
+        if self.escala != 1.0:
+            rgb_frame = cv2.resize(rgb_frame, None, fx=self.escala, fy=self.escala,
+                                   interpolation=cv2.INTER_AREA)
+        alto, ancho = rgb_frame.shape[:2]
+        payload = codificar_frame(rgb_frame, self.codificacion, self.calidad_jpeg)
+
+        self.secuencia += 1
+        t_envio = time.time()
+        with self._lock:
+            self.en_vuelo[self.secuencia] = t_envio
+        cabecera = CABECERA_FRAME.pack(MAGIC_FRAME, self.secuencia, t_envio,
+                                       CODIFICACIONES[self.codificacion], ancho, alto, len(payload))
+        try:
+            conexion.sendall(cabecera + payload)
+        except OSError as e:
+            # Si ya se desconectó (timeout) y se reconectó, no es esta conexión
+            if self.socket is conexion:
+                self._desconectar(f"error al enviar: {e}")
+            return
+
+        self.enviados += 1
+        self.bytes_enviados += len(cabecera) + len(payload)
+
+    def _bucle_receptor(self, conexion):
+        """Hilo que lee resultados del servidor"""
+        while True:
+            try:
+                cabecera = recibir_exacto(conexion, CABECERA_RESULTADO.size)
+                if cabecera is None:
+                    break
+                magic, secuencia, t_envio, ms_inferencia, num_manos = CABECERA_RESULTADO.unpack(cabecera)
+                if magic != MAGIC_RESULTADO:
+                    self._desconectar("respuesta con formato inválido")
+                    return
+
+                datos = recibir_exacto(conexion, num_manos * FLOATS_POR_MANO * 4) if num_manos else b''
+                if datos is None:
+                    break
+            except OSError:
+                break
+
+            # TCP entrega en orden, pero tras una reconexión pueden llegar
+            # respuestas viejas: solo se aceptan secuencias en vuelo y nuevas
+            with self._lock:
+                esperada = self.en_vuelo.pop(secuencia, None) is not None
+            if not esperada or secuencia <= self.ultima_secuencia_recibida:
+                continue
+
+            self.rtts.append(time.time() - t_envio)
+            self.inferencias.append(ms_inferencia / 1000)
+            self.ultima_secuencia_recibida = secuencia
+
+            valores = np.frombuffer(datos, dtype=np.float32).reshape(num_manos, FLOATS_POR_MANO)
+            self.ultimo_resultado = ResultadosRemotos(
+                [array_a_landmarks(mano[1:].reshape(21, 3)) for mano in valores],
+                [float(mano[0]) for mano in valores]
+            )
+
+        if self.socket is conexion:
+            self._desconectar("el servidor cerró la conexión")
+
+    def _desconectar(self, motivo):
+        """Cierra la conexión actual y deja al cliente listo para reintentar"""
+        if not self.conectado:
+            return
+        self.conectado = False
+        # Las respuestas que aún lleguen por esta conexión se ignoran
+        with self._lock:
+            self.en_vuelo.clear()
+        self.ultimo_resultado = ResultadosRemotos()
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+        self.log.warning(f"⚠️ Inferencia remota desconectada: {motivo}", evento='remoto_desconectado')
+
+    def estadisticas(self):
+        """Latencias (segundos) y contadores actuales"""
+        rtts = sorted(self.rtts)
+        return {
+            'rtt_medio': sum(rtts) / len(rtts) if rtts else 0.0,
+            'rtt_p95': rtts[int(len(rtts) * 0.95)] if rtts else 0.0,
+            'inferencia_media': sum(self.inferencias) / len(self.inferencias) if self.inferencias else 0.0,
+            'enviados': self.enviados,
+            'descartados': self.descartados,
+            'timeouts': self.timeouts,
+            'bytes_enviados': self.bytes_enviados
+        }
+
+    def _reportar_estadisticas(self):
+        """Registra latencias periódicamente"""
+        ahora = time.time()
+        if ahora - self.ultimo_reporte < self.intervalo_estadisticas:
+            return
+        self.ultimo_reporte = ahora
+
+        e = self.estadisticas()
+        self.log.info("🌐 Remoto: RTT %.1f ms (p95 %.1f), inferencia %.1f ms, enviados %d, descartados %d, timeouts %d",
+                      e['rtt_medio'] * 1000, e['rtt_p95'] * 1000, e['inferencia_media'] * 1000,
+                      e['enviados'], e['descartados'], e['timeouts'], evento='remoto_estadisticas', **e)
+
+    def close(self):
+        """Cierra la conexión (misma interfaz que Hands.close)"""
+        with self._hay_frame:
+            self.cerrado = True
+            self._hay_frame.notify()
+        if not self.conectado:
+            return
+        self.conectado = False
+        self.socket.close()
+        self.log.info("🌐 Conexión de inferencia remota cerrada")
+
+
+def crear_procesador_mediapipe(model_complexity=1, min_detection_confidence=0.8,
+                               min_tracking_confidence=0.7):
+    """
+    Crea el procesador por defecto del servidor: MediaPipe Hands
+
+    Returns:
+        Función rgb_frame -> lista de (puntuación, array (21, 3)), con un
+        atributo `close` que libera el grafo de MediaPipe
+    """
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        model_complexity=model_complexity,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence
+    )
+
+    def procesar(rgb_frame):
+        results = hands.process(rgb_frame)
+        if not results.multi_hand_landmarks:
+            return []
+        manos = []
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            puntuacion = results.multi_handedness[i].classification[0].score
+            manos.append((puntuacion, np.array([(p.x, p.y, p.z) for p in hand_landmarks.landmark])))
+        return manos
+
+    procesar.close = hands.close
+    return procesar
+
+
+class ServidorInferencia:
+    def __init__(self, host, port, crear_procesador, registro):
+        """
+        Servidor TCP que recibe frames, ejecuta la inferencia y devuelve landmarks
+
+        Cada cliente se atiende en su propio hilo con su propio procesador:
+        el tracking de Hands guarda estado entre frames y no se puede
+        compartir entre estaciones.
+
+        Args:
+            host, port: Dirección donde escuchar (port 0 = puerto libre)
+            crear_procesador: Función sin argumentos que devuelve un procesador
+                rgb_frame -> lista de (puntuación, array (21, 3)); si el
+                procesador tiene `close`, se llama al desconectarse el cliente
+            registro: RegistroAsincrono
+        """
+        self.crear_procesador = crear_procesador
+        self.log = registro
+        self.servidor = socket.create_server((host, port))
+        self.direccion = self.servidor.getsockname()
+        self.activo = True
+        self.conexiones = set()
+        self._lock = threading.Lock()
+
+    def atender(self):
+        """Acepta clientes hasta que se llame a detener()"""
+        self.log.info("🖥️ Servidor de inferencia escuchando en %s:%d", *self.direccion[:2])
+        while self.activo:
+            try:
+                conexion, origen = self.servidor.accept()
+            except OSError:
+                break
+            conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self.conexiones.add(conexion)
+            threading.Thread(target=self._hilo_cliente, args=(conexion, origen),
+                             name=f'cliente-{origen[0]}:{origen[1]}', daemon=True).start()
+
+    def _hilo_cliente(self, conexion, origen):
+        """Atiende un cliente con su propio procesador"""
+        self.log.info("🖥️ Cliente conectado: %s:%d", *origen[:2], evento='cliente_conectado')
+        procesador = None
+        try:
+            procesador = self.crear_procesador()
+            with conexion:
+                self._atender_cliente(conexion, procesador)
+        except Exception as e:
+            self.log.error(f"❌ Error atendiendo a {origen[0]}:{origen[1]}: {e}")
+        finally:
+            with self._lock:
+                self.conexiones.discard(conexion)
+            if procesador is not None and hasattr(procesador, 'close'):
+                procesador.close()
+            self.log.info("🖥️ Cliente desconectado: %s:%d", *origen[:2], evento='cliente_desconectado')
+
+    def _atender_cliente(self, conexion, procesador):
+        """Procesa los frames de un cliente en orden"""
+        while self.activo:
+            try:
+                cabecera = recibir_exacto(conexion, CABECERA_FRAME.size)
+                if cabecera is None:
+                    return
+                magic, secuencia, t_envio, codigo, ancho, alto, tamaño = CABECERA_FRAME.unpack(cabecera)
+                if magic != MAGIC_FRAME:
+                    self.log.error("❌ Frame con formato inválido, cerrando conexión")
+                    return
+                if tamaño > tamaño_payload_maximo(codigo, ancho, alto):
+                    self.log.error(f"❌ Frame rechazado ({ancho}x{alto}, códec {codigo}, "
+                                   f"{tamaño} bytes), cerrando conexión")
+                    return
+                payload = recibir_exacto(conexion, tamaño)
+                if payload is None:
+                    return
+            except OSError:
+                return
+
+            try:
+                rgb_frame = decodificar_frame(codigo, ancho, alto, payload)
+            except ValueError as e:
+                self.log.error(f"❌ Frame inválido ({e}), cerrando conexión")
+                return
+
+            inicio = time.perf_counter()
+            manos = procesador(rgb_frame)
+            ms_inferencia = (time.perf_counter() - inicio) * 1000
+
+            valores = np.empty((len(manos), FLOATS_POR_MANO), dtype=np.float32)
+            for i, (puntuacion, landmarks) in enumerate(manos):
+                valores[i, 0] = puntuacion
+                valores[i, 1:] = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+
+            respuesta = CABECERA_RESULTADO.pack(MAGIC_RESULTADO, secuencia, t_envio,
+                                                ms_inferencia, len(manos))
+            try:
+                conexion.sendall(respuesta + valores.tobytes())
+            except OSError:
+                return
+
+    def detener(self):
+        """Deja de aceptar clientes y cierra las conexiones abiertas"""
+        self.activo = False
+        self.servidor.close()
+        with self._lock:
+            conexiones = list(self.conexiones)
+        for conexion in conexiones:
+            try:
+                conexion.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def autoprueba(registro, clientes=3, frames=60):
+    """
+    Prueba de extremo a extremo en localhost con un procesador sintético
+
+    Comprueba que varios clientes simultáneos reciben cada uno los
+    resultados de sus propios frames, con un procesador por conexión, y
+    que un servidor que deja de responder provoca la desconexión del
+    cliente por timeout en lugar de una mano congelada.
+
+    Returns:
+        Lista de fallos (vacía si todo fue bien)
+    """
+    fallos = []
+    creados = []
+    bloqueo = threading.Event()
+    bloqueo.set()
+
+    def crear_procesador():
+        # La "mano" devuelta codifica el brillo del frame recibido, así cada
+        # cliente puede verificar que el resultado es de su propio frame
+        def procesar(rgb_frame):
+            bloqueo.wait()
+            return [(0.9, np.full((21, 3), rgb_frame.mean() / 255.0))]
+        creados.append(procesar)
+        return procesar
+
+    servidor = ServidorInferencia('127.0.0.1', 0, crear_procesador, registro)
+    threading.Thread(target=servidor.atender, daemon=True).start()
+    puerto = servidor.direccion[1]
+
+    try:
+        # Varios clientes a la vez, cada uno con su propio valor de frame
+        conexiones = [ClienteInferenciaRemota('127.0.0.1', puerto, registro, codificacion='raw', escala=1.0)
+                      for _ in range(clientes)]
+        for cliente in conexiones:
+            if not cliente.conectar():
+                fallos.append("un cliente no pudo conectarse")
+        valores = [40 * (i + 1) for i in range(clientes)]
+        recibidos = [0] * clientes
+        for _ in range(frames):
+            for i, cliente in enumerate(conexiones):
+                cliente.process(np.full((48, 64, 3), valores[i], dtype=np.uint8))
+            time.sleep(0.005)
+        time.sleep(0.2)
+        for i, cliente in enumerate(conexiones):
+            e = cliente.estadisticas()
+            recibidos[i] = len(cliente.rtts)
+            resultado = cliente.ultimo_resultado.multi_hand_landmarks
+            if not cliente.conectado:
+                fallos.append(f"cliente {i} desconectado")
+            elif not resultado or abs(resultado[0].landmark[0].x - valores[i] / 255.0) > 1e-3:
+                fallos.append(f"cliente {i} recibió un resultado ajeno o ninguno")
+            elif recibidos[i] < frames // 2:
+                fallos.append(f"cliente {i} solo recibió {recibidos[i]} de {e['enviados']} resultados")
+        if len(creados) != clientes:
+            fallos.append(f"se crearon {len(creados)} procesadores para {clientes} clientes")
+        for cliente in conexiones:
+            cliente.close()
+
+        # Servidor colgado: el cliente debe desconectarse por timeout
+        cliente = ClienteInferenciaRemota('127.0.0.1', puerto, registro, codificacion='raw',
+                                          escala=1.0, timeout_respuesta=0.3)
+        cliente.conectar()
+        bloqueo.clear()
+        limite = time.time() + 2.0
+        while cliente.conectado and time.time() < limite:
+            cliente.process(np.zeros((48, 64, 3), dtype=np.uint8))
+            time.sleep(0.01)
+        if cliente.conectado:
+            fallos.append("el cliente siguió conectado a un servidor colgado")
+        elif cliente.ultimo_resultado.multi_hand_landmarks:
+            fallos.append("el cliente conservó la mano tras el timeout")
+        bloqueo.set()
+        cliente.close()
+    finally:
+        bloqueo.set()
+        servidor.detener()
+
+    return fallos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de inferencia remota para el control de mouse')
+    parser.add_argument('--host', default='0.0.0.0',
+                       help='Dirección donde escuchar')
+    parser.add_argument('--port', type=int, default=5555,
+                       help='Puerto TCP')
+    parser.add_argument('--model-complexity', type=int, default=1, choices=[0, 1],
+                       help='Modelo de MediaPipe (0 = lite, 1 = completo)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Solo mostrar advertencias y errores en consola')
+    parser.add_argument('--autoprueba', action='store_true',
+                       help='Ejecutar la prueba de extremo a extremo en localhost y salir')
+    args = parser.parse_args()
+
+    registro = RegistroAsincrono(silencioso=args.quiet)
+
+    if args.autoprueba:
+        fallos = autoprueba(registro)
+        registro.cerrar()
+        if fallos:
+            print("❌ Autoprueba fallida:")
+            for fallo in fallos:
+                print(f"  - {fallo}")
+            sys.exit(1)
+        print("✅ Autoprueba de inferencia remota correcta")
+        return
+
+    servidor = ServidorInferencia(args.host, args.port,
+                                  lambda: crear_procesador_mediapipe(args.model_complexity), registro)
+    try:
+        servidor.atender()
+    except KeyboardInterrupt:
+        registro.info("\n🛑 Interrupción del usuario")
+    finally:
+        servidor.detener()
+        registro.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Motor de gestos sin dependencias de cámara, MediaPipe ni pantalla
+
+Contiene la lógica de extracción de puntos clave, clasificación de gestos,
+detección de scroll/zoom y mapeo a pantalla. Cada operación tiene una
+versión de un frame (la que usa el controlador en vivo, sobre el dict de
+puntos clave) y una versión por lotes sobre arrays (N, 21, 3) con las
+coordenadas normalizadas de MediaPipe, para análisis offline vectorizado.
+"""
+import math
+
+import numpy as np
+
+# Índices de MediaPipe de los puntos clave que usa el controlador
+PUNTOS_CLAVE = {
+    'muñeca': 0,
+    'pulgar_tip': 4,
+    'pulgar_ip': 3,
+    'indice_tip': 8,
+    'indice_pip': 6,
+    'medio_tip': 12,
+    'anular_tip': 16,
+    'meñique_tip': 20,
+    'centro_palma': 9
+}
+ORDEN_PUNTOS_CLAVE = tuple(PUNTOS_CLAVE)
+INDICES_PUNTOS_CLAVE = np.array([PUNTOS_CLAVE[nombre] for nombre in ORDEN_PUNTOS_CLAVE])
+
+DEDOS = ('pulgar', 'indice', 'medio', 'anular', 'meñique')
+
+# Gestos en orden de prioridad; el índice es el código usado en los lotes
+GESTOS = ('pinza', 'click_derecho', 'scroll', 'zoom', 'apuntar', 'puño', 'abierta', 'desconocido')
+CODIGO_GESTO = {gesto: codigo for codigo, gesto in enumerate(GESTOS)}
+
+# Umbrales de movimiento
+UMBRAL_SCROLL = 0.005
+UMBRAL_ZOOM = 0.01
+
+
+# Conversión de landmarks
+
+class PuntoLandmark:
+    """Landmark con la misma interfaz que los de MediaPipe (x, y, z)"""
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, campo):
+        # drawing_utils pregunta por visibility/presence, que aquí no existen
+        return False
+
+
+class ListaLandmarks:
+    """Equivalente a NormalizedLandmarkList: expone `.landmark`"""
+    __slots__ = ('landmark',)
+
+    def __init__(self, puntos):
+        self.landmark = puntos
+
+
+def array_a_landmarks(landmarks):
+    """Convierte un array (21, 3) en un objeto con la interfaz de MediaPipe"""
+    return ListaLandmarks([PuntoLandmark(float(x), float(y), float(z)) for x, y, z in landmarks])
+
+
+def puntos_clave_desde_landmarks(puntos):
+    """Extrae los puntos clave de una lista de landmarks con atributos x, y, z"""
+    # Literal explícito: es el camino caliente y evita iterar PUNTOS_CLAVE
+    return {
+        'muñeca': [puntos[0].x, puntos[0].y, puntos[0].z],
+        'pulgar_tip': [puntos[4].x, puntos[4].y, puntos[4].z],
+        'pulgar_ip': [puntos[3].x, puntos[3].y, puntos[3].z],
+        'indice_tip': [puntos[8].x, puntos[8].y, puntos[8].z],
+        'indice_pip': [puntos[6].x, puntos[6].y, puntos[6].z],
+        'medio_tip': [puntos[12].x, puntos[12].y, puntos[12].z],
+        'anular_tip': [puntos[16].x, puntos[16].y, puntos[16].z],
+        'meñique_tip': [puntos[20].x, puntos[20].y, puntos[20].z],
+        'centro_palma': [puntos[9].x, puntos[9].y, puntos[9].z]
+    }
+
+
+def landmarks_a_array(puntos):
+    """Convierte una lista de landmarks (x, y, z) en un array (21, 3)"""
+    return np.array([(p.x, p.y, p.z) for p in puntos], dtype=np.float64)
+
+
+def puntos_clave_desde_array(landmarks):
+    """Extrae los puntos clave de un array (21, 3)"""
+    return {nombre: landmarks[indice].tolist() for nombre, indice in PUNTOS_CLAVE.items()}
+
+
+def extraer_puntos_clave_lote(landmarks):
+    """
+    Extrae los puntos clave de un lote
+
+    Args:
+        landmarks: Array (N, 21, 3)
+
+    Returns:
+        Array (N, 9, 3) en el orden de ORDEN_PUNTOS_CLAVE
+    """
+    return landmarks[:, INDICES_PUNTOS_CLAVE]
+
+
+# Clasificación de gestos (un frame)
+
+def dedos_extendidos(puntos_clave):
+    """Detecta qué dedos están extendidos"""
+    palma_y = puntos_clave['centro_palma'][1]
+    return {
+        # Pulgar: comparar X porque se mueve lateralmente
+        'pulgar': puntos_clave['pulgar_tip'][0] > puntos_clave['pulgar_ip'][0],
+        # Otros dedos: comparar Y
+        'indice': puntos_clave['indice_tip'][1] < puntos_clave['indice_pip'][1],
+        'medio': puntos_clave['medio_tip'][1] < palma_y,
+        'anular': puntos_clave['anular_tip'][1] < palma_y,
+        'meñique': puntos_clave['meñique_tip'][1] < palma_y
+    }
+
+
+def distancia_pulgar_indice(puntos_clave):
+    """Distancia 2D entre las puntas de pulgar e índice"""
+    pulgar = puntos_clave['pulgar_tip']
+    indice = puntos_clave['indice_tip']
+    return math.hypot(pulgar[0] - indice[0], pulgar[1] - indice[1])
+
+
+def es_pinza(puntos_clave, umbral_pinza):
+    """Pulgar e índice juntos"""
+    return distancia_pulgar_indice(puntos_clave) < umbral_pinza
+
+
+def es_gesto_L(puntos_clave, umbral_pinza, dedos=None):
+    """Solo pulgar e índice extendidos y separados (más que una pinza)"""
+    if dedos is None:
+        dedos = dedos_extendidos(puntos_clave)
+
+    if not (dedos['pulgar'] and dedos['indice'] and sum(dedos.values()) == 2):
+        return False
+
+    return distancia_pulgar_indice(puntos_clave) > umbral_pinza * 2
+
+
+def clasificar_gesto(puntos_clave, umbral_pinza):
+    """Clasifica el gesto de un frame (ver GESTOS para el orden de prioridad)"""
+    dedos = dedos_extendidos(puntos_clave)
+    num_dedos = sum(dedos.values())
+
+    if es_pinza(puntos_clave, umbral_pinza):
+        return 'pinza'
+    if es_gesto_L(puntos_clave, umbral_pinza, dedos):
+        return 'click_derecho'
+    if dedos['indice'] and dedos['medio'] and num_dedos == 2:
+        return 'scroll'
+    if dedos['indice'] and dedos['medio'] and dedos['anular'] and num_dedos == 3:
+        return 'zoom'
+    if dedos['indice'] and num_dedos == 1:
+        return 'apuntar'
+    if num_dedos <= 1:
+        return 'puño'
+    if num_dedos >= 4:
+        return 'abierta'
+    return 'desconocido'
+
+
+def direccion_scroll(posiciones_y, umbral=UMBRAL_SCROLL):
+    """
+    Dirección de scroll a partir de las últimas posiciones Y del dedo medio
+
+    Returns:
+        'arriba', 'abajo' o None si el movimiento no es significativo
+    """
+    if len(posiciones_y) < 2:
+        return None
+
+    # Media de las diferencias consecutivas
+    movimiento_promedio = (posiciones_y[-1] - posiciones_y[0]) / (len(posiciones_y) - 1)
+
+    if abs(movimiento_promedio) > umbral:
+        return 'arriba' if movimiento_promedio < 0 else 'abajo'
+    return None
+
+
+def distancia_zoom(puntos_clave):
+    """Separación entre índice y anular usada como referencia de zoom"""
+    indice = puntos_clave['indice_tip']
+    anular = puntos_clave['anular_tip']
+    return math.hypot(indice[0] - anular[0], indice[1] - anular[1])
+
+
+def direccion_zoom(distancia_referencia, distancia_actual, umbral=UMBRAL_ZOOM):
+    """Returns: 'zoom_in', 'zoom_out' o None"""
+    cambio = distancia_actual - distancia_referencia
+    if abs(cambio) > umbral:
+        return 'zoom_in' if cambio > 0 else 'zoom_out'
+    return None
+
+
+def mapear_a_pantalla(x_mano, y_mano, ancho, alto, sensibilidad):
+    """
+    Mapea una posición normalizada de la mano a pantalla (sin suavizado)
+
+    La sensibilidad amplifica el desplazamiento respecto al centro de la
+    pantalla y el resultado se limita a los bordes.
+    """
+    center_x = ancho // 2
+    center_y = alto // 2
+
+    final_x = center_x + (x_mano * ancho - center_x) * sensibilidad
+    final_y = center_y + (y_mano * alto - center_y) * sensibilidad
+
+    final_x = max(0, min(ancho - 1, final_x))
+    final_y = max(0, min(alto - 1, final_y))
+    return final_x, final_y
+
+
+# Versiones por lotes (N, 21, 3)
+
+def dedos_extendidos_lote(landmarks):
+    """
+    Returns:
+        Array booleano (N, 5) en el orden de DEDOS
+    """
+    palma_y = landmarks[:, 9, 1]
+    return np.stack([
+        landmarks[:, 4, 0] > landmarks[:, 3, 0],
+        landmarks[:, 8, 1] < landmarks[:, 6, 1],
+        landmarks[:, 12, 1] < palma_y,
+        landmarks[:, 16, 1] < palma_y,
+        landmarks[:, 20, 1] < palma_y
+    ], axis=1)
+
+
+def clasificar_gestos_lote(landmarks, umbral_pinza):
+    """
+    Clasifica un lote de frames con la misma lógica que clasificar_gesto
+
+    Returns:
+        Array uint8 (N,) con códigos de GESTOS
+    """
+    dedos = dedos_extendidos_lote(landmarks)
+    num_dedos = dedos.sum(axis=1)
+    pulgar, indice, medio, anular = dedos[:, 0], dedos[:, 1], dedos[:, 2], dedos[:, 3]
+
+    distancia = np.hypot(landmarks[:, 4, 0] - landmarks[:, 8, 0],
+                         landmarks[:, 4, 1] - landmarks[:, 8, 1])
+
+    # np.select respeta el orden: gana la primera condición verdadera
+    condiciones = [
+        distancia < umbral_pinza,
+        pulgar & indice & (num_dedos == 2) & (distancia > umbral_pinza * 2),
+        indice & medio & (num_dedos == 2),
+        indice & medio & anular & (num_dedos == 3),
+        indice & (num_dedos == 1),
+        num_dedos <= 1,
+        num_dedos >= 4
+    ]
+    codigos = [CODIGO_GESTO[gesto] for gesto in GESTOS[:-1]]
+    return np.select(condiciones, codigos, default=CODIGO_GESTO['desconocido']).astype(np.uint8)
+
+
+def nombres_gestos(codigos):
+    """Convierte códigos de gesto en nombres"""
+    return np.asarray(GESTOS)[codigos]
+
+
+def _secuencia_activa(valores, activos):
+    """Índices de los frames activos y sus valores (todos si activos es None)"""
+    if activos is None:
+        return np.arange(len(valores)), valores
+    indices = np.flatnonzero(activos)
+    return indices, valores[indices]
+
+
+def direcciones_scroll_lote(landmarks, activos=None, umbral=UMBRAL_SCROLL):
+    """
+    Dirección de scroll por frame, equivalente a acumular el historial de
+    scroll frame a frame en el controlador
+
+    Args:
+        landmarks: Array (N, 21, 3) en orden temporal
+        activos: Máscara (N,) de frames que entran al historial de scroll
+                 (por ejemplo, los clasificados como 'scroll'); None = todos
+
+    Returns:
+        Array int8 (N,): -1 arriba, 1 abajo, 0 sin scroll
+    """
+    resultado = np.zeros(len(landmarks), dtype=np.int8)
+    indices, y = _secuencia_activa(landmarks[:, 12, 1], activos)
+    if len(y) < 3:
+        return resultado
+
+    # El controlador promedia las diferencias de las últimas 3 posiciones
+    movimiento = (y[2:] - y[:-2]) / 2
+    direccion = np.where(np.abs(movimiento) > umbral, np.sign(movimiento), 0)
+    resultado[indices[2:]] = direccion
+    return resultado
+
+
+def direcciones_zoom_lote(landmarks, activos=None, umbral=UMBRAL_ZOOM):
+    """
+    Dirección de zoom por frame respecto al frame activo anterior
+
+    Returns:
+        Array int8 (N,): 1 zoom_in, -1 zoom_out, 0 sin zoom
+    """
+    resultado = np.zeros(len(landmarks), dtype=np.int8)
+    distancias = np.hypot(landmarks[:, 8, 0] - landmarks[:, 16, 0],
+                          landmarks[:, 8, 1] - landmarks[:, 16, 1])
+    indices, distancias = _secuencia_activa(distancias, activos)
+    if len(distancias) < 2:
+        return resultado
+
+    cambio = np.diff(distancias)
+    resultado[indices[1:]] = np.where(np.abs(cambio) > umbral, np.sign(cambio), 0)
+    return resultado
+
+
+def mapear_a_pantalla_lote(posiciones, ancho, alto, sensibilidad):
+    """
+    Mapea posiciones normalizadas (N, 2) a pantalla (sin suavizado)
+
+    Returns:
+        Array float (N, 2)
+    """
+    centro = np.array([ancho // 2, alto // 2], dtype=np.float64)
+    tamaño = np.array([ancho, alto], dtype=np.float64)
+    final = centro + (posiciones * tamaño - centro) * sensibilidad
+    return np.clip(final, 0, tamaño - 1)
+
+
+def suavizar_lote(objetivos, factor, inicial=(0.0, 0.0), bloque=256):
+    """
+    Aplica el suavizado exponencial del controlador a una secuencia
+
+    Equivale a `actual += (objetivo - actual) * factor` frame a frame. Se
+    resuelve por bloques con una matriz triangular de pesos para evitar el
+    bucle de Python: dentro de un bloque, y[n] = r^(n+1) * y0 +
+    factor * sum_k r^(n-k) * x[k], con r = 1 - factor.
+
+    Args:
+        objetivos: Array (N, 2) de posiciones objetivo
+        factor: Factor de suavizado (0.1-1.0)
+        inicial: Posición antes del primer frame
+
+    Returns:
+        Array float (N, 2)
+    """
+    objetivos = np.asarray(objetivos, dtype=np.float64)
+    r = 1.0 - factor
+    tam = min(bloque, len(objetivos))
+    if tam == 0:
+        return objetivos.copy()
+
+    exponentes = np.arange(tam)
+    diferencias = exponentes[:, np.newaxis] - exponentes[np.newaxis, :]
+    pesos = np.where(diferencias >= 0, factor * r ** np.maximum(diferencias, 0), 0.0)
+    decaimiento = (r ** (exponentes + 1))[:, np.newaxis]
+
+    resultado = np.empty_like(objetivos)
+    previo = np.asarray(inicial, dtype=np.float64)
+    for inicio in range(0, len(objetivos), tam):
+        x = objetivos[inicio:inicio + tam]
+        n = len(x)
+        resultado[inicio:inicio + n] = pesos[:n, :n] @ x + decaimiento[:n] * previo
+        previo = resultado[inicio + n - 1]
+    return resultado
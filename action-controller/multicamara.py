@@ -0,0 +1,469 @@
+import argparse
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from motor_gestos import array_a_landmarks
+from inferencia_remota import ResultadosRemotos, crear_procesador_mediapipe
+from registro import RegistroAsincrono
+
+MODOS_FUSION = ('mejor', 'confianza')
+
+# Contorno de la palma: muñeca y nudillos de índice, medio, anular y meñique
+PUNTOS_PALMA = [0, 5, 9, 13, 17]
+
+AFIN_IDENTIDAD = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+
+
+def calidad_vista(landmarks):
+    """
+    Calidad de la vista de una mano en una cámara
+
+    Área de la palma en la imagen por la fracción de landmarks dentro del
+    encuadre: una mano de perfil, lejana o cortada por el borde ocupa
+    menos palma visible. (La puntuación de Hands mide la certeza de
+    izquierda/derecha y apenas cambia con la oclusión.)
+
+    Args:
+        landmarks: Array (21, 3) en coordenadas normalizadas de la cámara
+    """
+    x, y = landmarks[PUNTOS_PALMA, 0], landmarks[PUNTOS_PALMA, 1]
+    area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+    dentro = np.mean(np.all((landmarks[:, :2] >= 0.0) & (landmarks[:, :2] <= 1.0), axis=1))
+    return float(area * dentro)
+
+
+def ajustar_afin(origen, destino):
+    """
+    Ajusta por mínimos cuadrados la afín 2D que lleva origen a destino
+
+    Args:
+        origen, destino: Arrays (21, 3) de la misma mano vista por dos cámaras
+
+    Returns:
+        (matriz 2x3, error cuadrático medio en coordenadas de destino)
+    """
+    a = np.column_stack([origen[:, :2], np.ones(len(origen))])
+    solucion, _, _, _ = np.linalg.lstsq(a, destino[:, :2], rcond=None)
+    error = float(np.sqrt(np.mean((a @ solucion - destino[:, :2]) ** 2)))
+    return solucion.T, error
+
+
+def aplicar_afin(afin, landmarks):
+    """Lleva landmarks a las coordenadas de referencia (z se escala como x/y)"""
+    resultado = np.empty_like(landmarks, dtype=np.float64)
+    resultado[:, :2] = landmarks[:, :2] @ afin[:, :2].T + afin[:, 2]
+    resultado[:, 2] = landmarks[:, 2] * np.sqrt(abs(np.linalg.det(afin[:, :2])))
+    return resultado
+
+
+class CamaraInferencia:
+    def __init__(self, indice, procesador, registro, width=640, height=480, espejo=True,
+                 condicion=None):
+        """
+        Captura e inferencia de una cámara en su propio hilo
+
+        MediaPipe y OpenCV liberan el GIL durante la inferencia y la captura,
+        así que varias cámaras se procesan en paralelo con hilos.
+
+        Args:
+            indice: Índice de la cámara
+            procesador: Función rgb_frame -> lista de (puntuación, array (21, 3))
+            registro: RegistroAsincrono
+            width, height: Resolución solicitada
+            espejo: Voltear el frame como el controlador en vivo
+            condicion: threading.Condition a notificar con cada resultado nuevo
+        """
+        self.indice = indice
+        self.procesador = procesador
+        self.log = registro
+        self.width = width
+        self.height = height
+        self.espejo = espejo
+        self.condicion = condicion if condicion is not None else threading.Condition()
+
+        self.cap = None
+        self._hilo = None
+        self.activa = False
+
+        # Último resultado: (secuencia, t_captura, frame, manos)
+        self.ultimo = (0, 0.0, None, [])
+        self.latencias = deque(maxlen=100)
+        self.frames = 0
+
+    def abrir(self):
+        """Abre la cámara y arranca el hilo; devuelve True si tuvo éxito"""
+        self.cap = cv2.VideoCapture(self.indice)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, 30)
+        # Sin cola en el driver: si la inferencia va más lenta que la
+        # cámara, se procesa el frame más reciente y no uno atrasado
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        if not self.cap.isOpened():
+            self.log.error(f"❌ No se puede abrir la cámara {self.indice}")
+            return False
+
+        self.log.info(f"📹 Cámara {self.indice}: {int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+                      f"{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}")
+        self.activa = True
+        self._hilo = threading.Thread(target=self._bucle, name=f'camara-{self.indice}', daemon=True)
+        self._hilo.start()
+        return True
+
+    def _bucle(self):
+        """Hilo de captura e inferencia"""
+        secuencia = 0
+        try:
+            while self.activa:
+                ret, frame = self.cap.read()
+                t_captura = time.monotonic()
+                if not ret:
+                    self.log.error(f"❌ Error al leer frame de la cámara {self.indice}")
+                    break
+
+                if self.espejo:
+                    frame = cv2.flip(frame, 1)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+                inicio = time.perf_counter()
+                manos = self.procesador(rgb_frame)
+                self.latencias.append(time.perf_counter() - inicio)
+
+                secuencia += 1
+                self.frames += 1
+                with self.condicion:
+                    self.ultimo = (secuencia, t_captura, frame, manos)
+                    self.condicion.notify_all()
+        except Exception as e:
+            self.log.error(f"❌ Cámara {self.indice} detenida por un error: {e!r}",
+                           evento='camara_error', camara=self.indice)
+        finally:
+            # La fusión deja de esperar a esta cámara y, si era la última,
+            # siguiente() informa que no quedan cámaras
+            with self.condicion:
+                self.activa = False
+                self.condicion.notify_all()
+
+    def cerrar(self):
+        """Detiene el hilo, libera la cámara y cierra el procesador"""
+        self.activa = False
+        if self._hilo is not None:
+            self._hilo.join(timeout=2.0)
+        if self.cap is not None:
+            self.cap.release()
+        # Si el hilo sigue dentro de una inferencia no se puede cerrar el
+        # grafo debajo de él; como es daemon, el proceso lo libera al salir
+        hilo_vivo = self._hilo is not None and self._hilo.is_alive()
+        if not hilo_vivo and hasattr(self.procesador, 'close'):
+            self.procesador.close()
+
+
+class FusionMultiCamara:
+    def __init__(self, indices, registro, modo='mejor', tolerancia=0.05, margen_cambio=0.25,
+                 min_observaciones=10, error_alineacion=0.05, width=640, height=480,
+                 timeout_arranque=10.0, intervalo_estadisticas=5.0, **parametros_modelo):
+        """
+        Combina varias cámaras en un único estado de mano
+
+        Cada cámara captura e infiere en su propio hilo con su propia
+        instancia de Hands. `siguiente()` espera un resultado nuevo, alinea
+        las cámaras por tiempo de captura (descarta las que se quedaron más
+        de `tolerancia` segundos atrás) y fusiona las que ven la mano.
+
+        Cada cámara tiene sus propias coordenadas normalizadas, así que
+        antes de fusionar se llevan a las de la primera cámara (la
+        referencia) con una afín 2D por cámara. La afín se aprende sola:
+        cada vez que una cámara y otra ya alineada ven la mano a la vez, se
+        ajusta con los 21 pares de landmarks y se promedia con las
+        anteriores. Una cámara no participa hasta tener
+        `min_observaciones` ajustes. La vista previa muestra siempre la
+        cámara de referencia, que es donde están las coordenadas.
+
+        - 'mejor': usa la vista de mayor calidad (área de palma visible),
+          con histéresis para no alternar entre cámaras parecidas
+        - 'confianza': promedio de los landmarks alineados ponderado por
+          la calidad de cada vista
+
+        Args:
+            indices: Índices de las cámaras (la primera es la referencia)
+            registro: RegistroAsincrono
+            modo: 'mejor' o 'confianza'
+            tolerancia: Máxima diferencia de tiempo de captura entre cámaras
+            margen_cambio: Calidad relativa extra que necesita otra cámara
+                para reemplazar a la actual en modo 'mejor'
+            min_observaciones: Ajustes necesarios para usar una cámara
+            error_alineacion: Error máximo de un ajuste para aceptarlo
+                (descarta instantes con la mano mal detectada en una vista)
+            width, height: Resolución por cámara (baja por defecto: varias
+                cámaras USB suelen compartir el ancho de banda del bus)
+            timeout_arranque: Segundos de espera del primer resultado
+                (apertura de las cámaras y carga de los grafos)
+            intervalo_estadisticas: Segundos entre reportes de rendimiento
+            parametros_modelo: Parámetros de crear_procesador_mediapipe
+        """
+        if modo not in MODOS_FUSION:
+            raise ValueError(f"Modo de fusión desconocido: {modo}")
+
+        self.log = registro
+        self.modo = modo
+        self.tolerancia = tolerancia
+        self.margen_cambio = margen_cambio
+        self.min_observaciones = min_observaciones
+        self.error_alineacion = error_alineacion
+        self.timeout_arranque = timeout_arranque
+        self.intervalo_estadisticas = intervalo_estadisticas
+
+        self.condicion = threading.Condition()
+        self.camaras = [
+            CamaraInferencia(indice, crear_procesador_mediapipe(**parametros_modelo), registro,
+                             width=width, height=height, condicion=self.condicion)
+            for indice in indices
+        ]
+        self.consumidas = [0] * len(self.camaras)
+        self.camara_actual = None
+
+        # Afín de cada cámara a la referencia y ajustes acumulados
+        self.alineaciones = [AFIN_IDENTIDAD] + [None] * (len(self.camaras) - 1)
+        self.observaciones = [min_observaciones] + [0] * (len(self.camaras) - 1)
+
+        # Estadísticas
+        self.edades = deque(maxlen=200)
+        self.fusionados = 0
+        self.inicio = None
+        self.ultimo_reporte = time.time()
+
+    def abrir(self):
+        """Abre todas las cámaras; devuelve True si todas se abrieron"""
+        if not all(camara.abrir() for camara in self.camaras):
+            self.close()
+            return False
+        self.inicio = time.monotonic()
+        return True
+
+    @property
+    def activa(self):
+        """True mientras al menos una cámara siga produciendo frames"""
+        return any(camara.activa for camara in self.camaras)
+
+    def siguiente(self, timeout=None):
+        """
+        Espera el siguiente conjunto alineado de resultados y lo fusiona
+
+        Tras el primer resultado nuevo espera como máximo `tolerancia`
+        segundos a que el resto de cámaras entregue el suyo, así cada
+        resultado se usa una sola vez y las cámaras lentas no frenan el loop.
+
+        Args:
+            timeout: Segundos de espera de un resultado nuevo; por defecto
+                `timeout_arranque` hasta el primer resultado y 1 s después
+
+        Returns:
+            (frame de la cámara de referencia, resultados con la interfaz
+            de Hands.process en sus coordenadas), (None, None) si no llegó nada en `timeout`, o
+            (None, False) si todas las cámaras dejaron de producir frames
+        """
+        if timeout is None:
+            timeout = self.timeout_arranque if not any(self.consumidas) else 1.0
+
+        def nuevas():
+            return [camara.ultimo[0] > consumida
+                    for camara, consumida in zip(self.camaras, self.consumidas)]
+
+        with self.condicion:
+            self.condicion.wait_for(lambda: any(nuevas()) or not self.activa, timeout=timeout)
+            if not any(nuevas()):
+                return (None, None) if self.activa else (None, False)
+
+            self.condicion.wait_for(
+                lambda: all(nueva or not camara.activa
+                            for nueva, camara in zip(nuevas(), self.camaras)),
+                timeout=self.tolerancia)
+            frescas = nuevas()
+            ultimos = [camara.ultimo for camara in self.camaras]
+        self.consumidas = [ultimo[0] for ultimo in ultimos]
+
+        # Alineación temporal: solo resultados nuevos capturados cerca del más reciente
+        t_referencia = max(ultimo[1] for ultimo, fresca in zip(ultimos, frescas) if fresca)
+        candidatos = [(i, ultimo) for i, (ultimo, fresca) in enumerate(zip(ultimos, frescas))
+                      if fresca and t_referencia - ultimo[1] <= self.tolerancia]
+
+        # La vista previa muestra la referencia aunque su resultado sea viejo
+        frame = ultimos[0][2] if ultimos[0][2] is not None else candidatos[0][1][2]
+        results = self.fusionar(candidatos)
+
+        self.fusionados += 1
+        self.edades.append(time.monotonic() - t_referencia)
+        self._reportar_estadisticas()
+        return frame, results
+
+    def alineada(self, i):
+        """True si la cámara i ya tiene coordenadas de referencia fiables"""
+        return self.observaciones[i] >= self.min_observaciones
+
+    def _actualizar_alineaciones(self, con_mano):
+        """Refina la afín de cada cámara contra la mejor vista ya alineada"""
+        alineadas = [(i, mano) for i, (_, mano) in con_mano if self.alineada(i)]
+        if not alineadas or len(con_mano) < 2:
+            return
+        i_destino, mano_destino = max(alineadas, key=lambda c: calidad_vista(c[1]))
+        destino = aplicar_afin(self.alineaciones[i_destino], mano_destino)
+
+        for i, (_, mano) in con_mano:
+            if i == 0 or i == i_destino:
+                continue
+            afin, error = ajustar_afin(mano, destino)
+            if error > self.error_alineacion:
+                continue
+            # Media de los primeros ajustes y luego media móvil, para seguir
+            # a una cámara que se mueve un poco
+            peso = max(1.0 / (self.observaciones[i] + 1), 0.05)
+            anterior = self.alineaciones[i]
+            self.alineaciones[i] = afin if anterior is None else (1 - peso) * anterior + peso * afin
+            self.observaciones[i] += 1
+            if self.observaciones[i] == self.min_observaciones:
+                self.log.info("📹 Cámara %d alineada con la cámara %d (error %.3f)",
+                              self.camaras[i].indice, self.camaras[0].indice, error,
+                              evento='multicamara_alineada', camara=self.camaras[i].indice)
+
+    def fusionar(self, candidatos):
+        """
+        Fusiona los resultados alineados de las cámaras
+
+        Returns:
+            Resultados con la interfaz de Hands.process, en coordenadas de
+            la cámara de referencia
+        """
+        con_mano = [(i, ultimo[3][0]) for i, ultimo in candidatos if ultimo[3]]
+        self._actualizar_alineaciones(con_mano)
+
+        # (cámara, puntuación, landmarks en la referencia, calidad de la vista)
+        vistas = [(i, puntuacion, aplicar_afin(self.alineaciones[i], mano), calidad_vista(mano))
+                  for i, (puntuacion, mano) in con_mano if self.alineada(i)]
+        if not vistas:
+            return ResultadosRemotos()
+
+        if self.modo == 'confianza':
+            calidades = np.array([calidad for _, _, _, calidad in vistas])
+            pesos = calidades / calidades.sum() if calidades.sum() > 0 else np.full(len(vistas), 1 / len(vistas))
+            fusionados = np.tensordot(pesos, np.stack([mano for _, _, mano, _ in vistas]), axes=1)
+            self.camara_actual = vistas[int(np.argmax(calidades))][0]
+            return ResultadosRemotos([array_a_landmarks(fusionados)],
+                                     [max(puntuacion for _, puntuacion, _, _ in vistas)])
+
+        # 'mejor': la cámara actual se mantiene salvo que otra la supere
+        # claramente; al estar alineadas, cambiar de vista no mueve el cursor
+        mejor = max(vistas, key=lambda v: v[3])
+        actual = next((v for v in vistas if v[0] == self.camara_actual), None)
+        if actual is not None and mejor[3] < actual[3] * (1 + self.margen_cambio):
+            mejor = actual
+        if mejor[0] != self.camara_actual:
+            self.log.debug("📹 Vista principal: cámara %d", self.camaras[mejor[0]].indice,
+                           evento='multicamara_vista', camara=self.camaras[mejor[0]].indice)
+            self.camara_actual = mejor[0]
+
+        _, puntuacion, mano, _ = mejor
+        return ResultadosRemotos([array_a_landmarks(mano)], [puntuacion])
+
+    def estadisticas(self):
+        """Rendimiento de la fusión y de cada cámara"""
+        transcurrido = time.monotonic() - self.inicio if self.inicio else 0.0
+        edades = sorted(self.edades)
+        return {
+            'camaras': len(self.camaras),
+            'alineadas': sum(self.alineada(i) for i in range(len(self.camaras))),
+            'fps_fusion': self.fusionados / transcurrido if transcurrido > 0 else 0.0,
+            'edad_media': sum(edades) / len(edades) if edades else 0.0,
+            'edad_p95': edades[int(len(edades) * 0.95)] if edades else 0.0,
+            'fps_camaras': [camara.frames / transcurrido if transcurrido > 0 else 0.0
+                            for camara in self.camaras],
+            'inferencia_media': [sum(camara.latencias) / len(camara.latencias) if camara.latencias else 0.0
+                                 for camara in self.camaras]
+        }
+
+    def _reportar_estadisticas(self):
+        """Registra el rendimiento periódicamente"""
+        ahora = time.time()
+        if ahora - self.ultimo_reporte < self.intervalo_estadisticas:
+            return
+        self.ultimo_reporte = ahora
+
+        e = self.estadisticas()
+        por_camara = ", ".join(f"{camara.indice}: {fps:.1f} FPS/{inferencia * 1000:.1f} ms"
+                               for camara, fps, inferencia
+                               in zip(self.camaras, e['fps_camaras'], e['inferencia_media']))
+        self.log.info("📹 Multicámara: %.1f FPS fusionados, edad %.1f ms (p95 %.1f), %d/%d alineadas | %s",
+                      e['fps_fusion'], e['edad_media'] * 1000, e['edad_p95'] * 1000,
+                      e['alineadas'], e['camaras'], por_camara,
+                      evento='multicamara_estadisticas', **e)
+
+    def close(self):
+        """Detiene los hilos y libera las cámaras (misma interfaz que Hands)"""
+        for camara in self.camaras:
+            camara.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Mide rendimiento y latencia de la fusión multicámara según el número de cámaras')
+    parser.add_argument('--cameras', default='0,1',
+                       help='Índices de las cámaras separados por comas')
+    parser.add_argument('--modo', default='mejor', choices=MODOS_FUSION,
+                       help='Modo de fusión')
+    parser.add_argument('--duracion', type=float, default=10.0,
+                       help='Segundos de medición por configuración')
+    parser.add_argument('--model-complexity', type=int, default=1, choices=[0, 1],
+                       help='Complejidad del modelo de MediaPipe')
+    args = parser.parse_args()
+
+    indices = [int(indice) for indice in args.cameras.split(',')]
+    registro = RegistroAsincrono(nivel='WARNING')
+
+    filas = []
+    try:
+        # 1, 2, ... N cámaras: la latencia añadida se mide contra una sola
+        for n in range(1, len(indices) + 1):
+            fusion = FusionMultiCamara(indices[:n], registro, modo=args.modo,
+                                       intervalo_estadisticas=float('inf'),
+                                       model_complexity=args.model_complexity)
+            if not fusion.abrir():
+                print(f"❌ No se pudieron abrir las cámaras {indices[:n]}")
+                break
+
+            # Descartar el arranque (apertura de cámaras y primer grafo)
+            fusion.siguiente()
+            fusion.fusionados = 0
+            fusion.edades.clear()
+            fusion.inicio = time.monotonic()
+            for camara in fusion.camaras:
+                camara.frames = 0
+
+            limite = time.monotonic() + args.duracion
+            while time.monotonic() < limite:
+                if fusion.siguiente()[1] is False:
+                    break
+            filas.append(fusion.estadisticas())
+            fusion.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        registro.cerrar()
+
+    if not filas:
+        return
+
+    base = filas[0]['edad_media']
+    print(f"{'Cámaras':>8}{'FPS fusión':>12}{'Edad ms':>10}{'p95 ms':>10}{'Añadida ms':>12}  FPS por cámara")
+    print("-" * 80)
+    for fila in filas:
+        por_camara = " ".join(f"{fps:.1f}" for fps in fila['fps_camaras'])
+        print(f"{fila['camaras']:>8}{fila['fps_fusion']:>12.1f}{fila['edad_media'] * 1000:>10.1f}"
+              f"{fila['edad_p95'] * 1000:>10.1f}{(fila['edad_media'] - base) * 1000:>12.1f}  {por_camara}")
+
+
+if __name__ == "__main__":
+    main()
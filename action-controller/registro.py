@@ -0,0 +1,188 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+# Niveles de registro (mismos valores numéricos que el módulo logging)
+NIVELES = {
+    'DEBUG': 10,
+    'INFO': 20,
+    'WARNING': 30,
+    'ERROR': 40
+}
+NOMBRES_NIVEL = {valor: nombre for nombre, valor in NIVELES.items()}
+
+# Claves propias de cada registro JSON; un campo del llamador con el mismo
+# nombre se guarda con el prefijo 'campo_' en lugar de pisarlas
+CLAVES_RESERVADAS = ('ts', 'nivel', 'mensaje')
+
+
+class RegistroAsincrono:
+    def __init__(self, nivel='INFO', capacidad=4096, silencioso=False,
+                 ruta_json=None, intervalo_escritura=0.1, salida=None):
+        """
+        Registro con niveles que nunca bloquea al hilo que lo usa
+
+        Los mensajes se guardan en un buffer circular en memoria y un hilo
+        escritor en segundo plano los formatea y los vuelca a consola y,
+        opcionalmente, a un archivo JSON-lines. El hilo de visión solo hace
+        un `deque.append`, sin locks ni E/S; si el escritor se atrasa se
+        descartan los mensajes más antiguos en lugar de esperar. Un error al
+        escribir en un destino (tubería cerrada, emoji en una consola cp1252)
+        solo pierde ese mensaje en ese destino y se informa una vez.
+
+        Args:
+            nivel: Nivel mínimo a registrar ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+            capacidad: Tamaño del buffer circular de mensajes pendientes
+            silencioso: Si es True, la consola solo muestra WARNING o superior
+            ruta_json: Archivo JSON-lines donde guardar todos los mensajes
+            intervalo_escritura: Segundos entre vaciados del buffer
+            salida: Stream de consola (por defecto sys.stdout)
+        """
+        self.nivel = NIVELES[nivel.upper()]
+        self.capacidad = capacidad
+        self.silencioso = silencioso
+        self.ruta_json = ruta_json
+        self.intervalo_escritura = intervalo_escritura
+        self.salida = salida if salida is not None else sys.stdout
+
+        # Buffer circular: append/popleft son atómicos en CPython
+        self.buffer = deque(maxlen=capacidad)
+        self.descartados = 0
+        self._descartados_reportados = 0
+        self._destinos_fallidos = set()
+
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle_escritor,
+                                      name='registro-escritor', daemon=True)
+        self._hilo.start()
+
+    def _registrar(self, nivel, mensaje, args, campos):
+        """Encola un mensaje sin formatearlo (el formateo lo hace el escritor)"""
+        if nivel < self.nivel:
+            return
+        if len(self.buffer) >= self.capacidad:
+            self.descartados += 1
+        self.buffer.append((time.time(), nivel, mensaje, args, campos))
+
+    def debug(self, mensaje, *args, **campos):
+        self._registrar(10, mensaje, args, campos)
+
+    def info(self, mensaje, *args, **campos):
+        self._registrar(20, mensaje, args, campos)
+
+    def warning(self, mensaje, *args, **campos):
+        self._registrar(30, mensaje, args, campos)
+
+    def error(self, mensaje, *args, **campos):
+        self._registrar(40, mensaje, args, campos)
+
+    def _bucle_escritor(self):
+        """Hilo en segundo plano que vacía el buffer periódicamente"""
+        archivo_json = None
+        if self.ruta_json:
+            try:
+                archivo_json = open(self.ruta_json, 'a', encoding='utf-8')
+            except OSError as e:
+                self.salida.write(f"❌ No se puede abrir el registro JSON: {e}\n")
+
+        try:
+            while not self._detener.wait(self.intervalo_escritura):
+                self._vaciar(archivo_json)
+            self._vaciar(archivo_json)
+        finally:
+            if archivo_json:
+                archivo_json.close()
+
+    def _vaciar(self, archivo_json):
+        """Escribe todos los mensajes pendientes"""
+        perdidos = self.descartados - self._descartados_reportados
+        self._descartados_reportados += perdidos
+
+        escrito = False
+        while True:
+            try:
+                marca, nivel, mensaje, args, campos = self.buffer.popleft()
+            except IndexError:
+                break
+
+            try:
+                texto = mensaje % args if args else mensaje
+            except (TypeError, ValueError):
+                texto = f"{mensaje} {args}"
+
+            escrito |= self._escribir(archivo_json, marca, nivel, texto, campos)
+
+        if perdidos:
+            escrito |= self._escribir(archivo_json, time.time(), 30,
+                                      f"⚠️ Registro saturado: {perdidos} mensajes descartados",
+                                      {'descartados': perdidos})
+
+        if escrito:
+            self._proteger('consola', archivo_json, self.salida.flush)
+        if archivo_json:
+            self._proteger('json', archivo_json, archivo_json.flush)
+
+    def _escribir(self, archivo_json, marca, nivel, texto, campos):
+        """Escribe un mensaje ya formateado; devuelve True si salió por consola"""
+        if archivo_json:
+            registro = {
+                'ts': marca,
+                'nivel': NOMBRES_NIVEL.get(nivel, str(nivel)),
+                'mensaje': texto
+            }
+            for clave, valor in campos.items():
+                registro[f'campo_{clave}' if clave in CLAVES_RESERVADAS else clave] = valor
+            linea = json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+            self._proteger('json', archivo_json, lambda: archivo_json.write(linea))
+
+        if self.silencioso and nivel < 30:
+            return False
+        return self._proteger('consola', archivo_json, lambda: self.salida.write(texto + "\n"))
+
+    def _proteger(self, destino, archivo_json, escribir):
+        """
+        Ejecuta una escritura sin dejar que un error mate al hilo escritor
+
+        Args:
+            destino: 'consola' o 'json'
+            archivo_json: Archivo JSON abierto (o None), para informar fallos de consola
+            escribir: Función sin argumentos que hace la escritura
+
+        Returns:
+            True si la escritura tuvo éxito
+        """
+        try:
+            escribir()
+            return True
+        except Exception as e:
+            if destino in self._destinos_fallidos:
+                return False
+            self._destinos_fallidos.add(destino)
+            error = e
+
+        # Primer fallo de este destino: avisar por el otro (y por stderr)
+        aviso = f"⚠️ Falló la escritura del registro en {destino}: {error!r}"
+        otros = []
+        if destino == 'consola':
+            if archivo_json:
+                linea = json.dumps({'ts': time.time(), 'nivel': 'WARNING', 'mensaje': aviso},
+                                   ensure_ascii=False) + "\n"
+                otros.append(lambda: archivo_json.write(linea))
+        else:
+            otros.append(lambda: self.salida.write(aviso + "\n"))
+        if self.salida is not sys.stderr:
+            # Sin emoji: stderr puede tener la misma codificación limitada
+            otros.append(lambda: sys.stderr.write(aviso.lstrip('⚠️ ') + "\n"))
+        for escribir_aviso in otros:
+            try:
+                escribir_aviso()
+            except Exception:
+                pass
+        return False
+
+    def cerrar(self):
+        """Detiene el escritor y vacía los mensajes pendientes"""
+        self._detener.set()
+        self._hilo.join(timeout=2.0)